@@ -0,0 +1,437 @@
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from data_loader import COST_COLUMN, DATA_FILE, iter_chunks
+
+CATEGORY_COLUMNS = ['listed_in(type)', 'online_order', 'book_table']
+CUISINE_COLUMN = 'cuisines'
+NUMERIC_COLUMNS = ['rate', 'votes', COST_COLUMN]
+
+# Ratings come as "x.y/5" so 0.1-wide bins centred on each step are exact
+RATE_BINS = np.round(np.arange(-0.05, 5.1, 0.1), 2)
+RATE_VALUES = np.round((RATE_BINS[:-1] + RATE_BINS[1:]) / 2, 1)
+# Costs in fixed 100-wide bins (mergeable across chunks, unlike bins=30 over the
+# data's own range); the last bin is open-ended and counts everything above 6000
+COST_BINS = np.append(np.arange(0, 6100, 100), np.inf)
+PRICE_RANGE_BINS = [0, 500, 1000, 1500, 2000, np.inf]
+PRICE_RANGE_LABELS = ['0-500', '501-1000', '1001-1500', '1501-2000', '2000+']
+
+TOP_VOTES = 20
+TOP_RATED = 10
+
+
+# Function to histogram a column into fixed bins, clipping outliers into the end bins
+# (with an infinite last edge, the top bin is a true overflow bin)
+def _fixed_histogram(values, edges):
+    values = np.clip(values[~np.isnan(values)], edges[0], np.nextafter(edges[-1], edges[0]))
+    return np.histogram(values, bins=edges)[0]
+
+
+# Function to histogram a column into fixed bins per group in a single pass.
+# Returns {group: counts}; rows with a missing group or value are skipped.
+def _grouped_histogram(groups, values, edges):
+    codes, uniques = pd.factorize(groups)
+    keep = (codes >= 0) & ~np.isnan(values)
+    clipped = np.clip(values[keep], edges[0], np.nextafter(edges[-1], edges[0]))
+    bins = np.searchsorted(edges, clipped, side='right') - 1
+    width = len(edges) - 1
+    counts = np.bincount(codes[keep] * width + bins, minlength=len(uniques) * width)
+    return dict(zip(uniques, counts.reshape(len(uniques), width)))
+
+
+# Function to find the fixed bin of each value (clipping outliers into the end
+# bins, like _fixed_histogram); missing values get -1
+def _bin_index(values, edges):
+    clipped = np.clip(values, edges[0], np.nextafter(edges[-1], edges[0]))
+    bins = np.searchsorted(edges, clipped, side='right') - 1
+    return np.where(np.isnan(values), -1, bins)
+
+
+# Function to count bin indexes (-1 for no value) into `width` bins
+def _count_bins(bins, width):
+    return np.bincount(bins[bins >= 0], minlength=width)
+
+
+# Function to count cuisines in a column of comma-separated lists ("North Indian, Chinese")
+def cuisine_counts(cuisines):
+    tokens = cuisines.dropna().astype(str).str.split(',').explode().str.strip()
+    return tokens[tokens != ''].value_counts(sort=False).astype('int64')
+
+
+# Function to read a quantile off a histogram of discrete values (linear, like numpy)
+def _quantile_from_counts(values, counts, q):
+    cumulative = np.cumsum(counts)
+    position = q * (cumulative[-1] - 1)
+    lower = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+    upper = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+    return lower + (upper - lower) * (position - np.floor(position))
+
+
+# Function to build the dict Axes.bxp expects from a histogram of discrete values
+def box_stats_from_counts(values, counts, label):
+    present = counts > 0
+    values, counts = values[present], counts[present]
+    q1, med, q3 = (_quantile_from_counts(values, counts, q) for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    return {
+        'label': label,
+        'med': med,
+        'q1': q1,
+        'q3': q3,
+        # Whiskers never reach inside the box, as in matplotlib's boxplot_stats
+        'whislo': min(values[inside].min(), q1),
+        'whishi': max(values[inside].max(), q3),
+        'fliers': values[~inside],
+        'mean': np.average(values, weights=counts),
+    }
+
+
+# Mergeable summary of the dataset: every sidebar view can be drawn from this
+# without keeping the rows around, so it works chunk by chunk on huge files
+class DatasetAggregates:
+    def __init__(self, top_votes=TOP_VOTES, top_rated=TOP_RATED):
+        self.rows = 0
+        self.counts = {column: pd.Series(dtype='int64') for column in CATEGORY_COLUMNS}
+        self.rate_hist = np.zeros(len(RATE_BINS) - 1, dtype=np.int64)
+        self.cost_hist = np.zeros(len(COST_BINS) - 1, dtype=np.int64)
+        self.price_range = pd.Series(0, index=PRICE_RANGE_LABELS, dtype='int64')
+        self.cuisines = pd.Series(dtype='int64')  # Stays empty if the CSV has no cuisines column
+        # Per-group rating histograms: the quantile sketch behind the box plots.
+        # Ratings sit on a 0.1 grid, so 51 counts per group give exact quartiles
+        # and whiskers, and two sketches merge by adding their counts.
+        self.rate_hist_by = {column: {} for column in CATEGORY_COLUMNS}
+        # Running mean / co-moment matrix for the correlation heatmap (Welford / Chan)
+        self.moment_n = 0
+        self.moment_mean = np.zeros(len(NUMERIC_COLUMNS))
+        self.comoment = np.zeros((len(NUMERIC_COLUMNS), len(NUMERIC_COLUMNS)))
+        # Bounded min-heaps of (value, sequence, name) for the top-N lists
+        self.top_votes_size = top_votes
+        self.top_rated_size = top_rated
+        self.top_votes_heap = []
+        self.top_rated_heap = []
+        self._sequence = itertools.count()
+
+    @classmethod
+    def from_frame(cls, data, **kwargs):
+        aggregates = cls(**kwargs)
+        aggregates.update(data)
+        return aggregates
+
+    # Function to build the aggregates of the rows at `positions` (e.g. from a
+    # FilterIndex) straight from AggregateColumns, without copying the rows out
+    @classmethod
+    def from_positions(cls, columns, positions, **kwargs):
+        aggregates = cls(**kwargs)
+        aggregates.rows = len(positions)
+        aggregates.rate_hist += _count_bins(columns.rate_bins[positions], len(RATE_BINS) - 1)
+        aggregates.cost_hist += _count_bins(columns.cost_bins[positions], len(COST_BINS) - 1)
+        aggregates.price_range += _count_bins(columns.price_range_codes[positions], len(PRICE_RANGE_LABELS))
+        width = len(RATE_BINS) - 1
+        for column in CATEGORY_COLUMNS:
+            categories = columns.categories[column]
+            cells = _count_bins(columns.rate_cells[column][positions], len(categories) * (width + 1))
+            cells = cells.reshape(len(categories), width + 1)
+            aggregates.counts[column] = pd.Series(cells.sum(axis=1), index=categories, dtype='int64')
+            aggregates.rate_hist_by[column] = {value: hist for value, hist in zip(categories, cells[:, :width])
+                                               if hist.any()}
+        if columns.cuisine_rows is not None:
+            selected = np.zeros(columns.rows, dtype=bool)
+            selected[positions] = True
+            tokens = columns.cuisine_codes[selected[columns.cuisine_rows]]
+            counts = pd.Series(np.bincount(tokens, minlength=len(columns.cuisines)), index=columns.cuisines)
+            aggregates.cuisines = counts[counts > 0].astype('int64')
+
+        values = columns.numeric[positions[columns.complete[positions]]]
+        if len(values):
+            # From raw cross products rather than a centred copy of every row; no
+            # column's spread is tiny next to its mean, so little precision is lost.
+            # (Summing rows as a matrix product is far quicker than mean(axis=0).)
+            mean = np.ones(len(values)) @ values / len(values)
+            aggregates._merge_moments(len(values), mean, values.T @ values - len(values) * np.outer(mean, mean))
+        for heap, size, column in ((aggregates.top_votes_heap, aggregates.top_votes_size, 'votes'),
+                                   (aggregates.top_rated_heap, aggregates.top_rated_size, 'rate')):
+            candidates = _top_candidates(columns.numeric[positions, NUMERIC_COLUMNS.index(column)], size)
+            aggregates._update_top(heap, size, columns.top_rows.take(positions[candidates]), column)
+        return aggregates
+
+    # Function to fold one chunk of rows into the running aggregates
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for column in CATEGORY_COLUMNS:
+            counts = chunk[column].value_counts(sort=False)
+            self.counts[column] = self.counts[column].add(counts.astype('int64'), fill_value=0).astype('int64')
+
+        rate = chunk['rate'].to_numpy(dtype=np.float64, na_value=np.nan)
+        cost = chunk[COST_COLUMN].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.rate_hist += _fixed_histogram(rate, RATE_BINS)
+        self.cost_hist += _fixed_histogram(cost, COST_BINS)
+        price_range = pd.cut(chunk[COST_COLUMN], bins=PRICE_RANGE_BINS, labels=PRICE_RANGE_LABELS)
+        self.price_range += price_range.value_counts().reindex(PRICE_RANGE_LABELS, fill_value=0)
+        if CUISINE_COLUMN in chunk:
+            self.cuisines = self.cuisines.add(cuisine_counts(chunk[CUISINE_COLUMN]), fill_value=0).astype('int64')
+
+        for column in CATEGORY_COLUMNS:
+            for value, hist in _grouped_histogram(chunk[column], rate, RATE_BINS).items():
+                current = self.rate_hist_by[column].get(value)
+                self.rate_hist_by[column][value] = hist if current is None else current + hist
+
+        self._update_moments(chunk)
+        self._update_top(self.top_votes_heap, self.top_votes_size, chunk, 'votes')
+        self._update_top(self.top_rated_heap, self.top_rated_size, chunk, 'rate')
+
+    def _update_moments(self, chunk):
+        values = chunk[NUMERIC_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values).any(axis=1)]
+        if not len(values):
+            return
+        n_b = len(values)
+        mean_b = values.mean(axis=0)
+        centred = values - mean_b
+        self._merge_moments(n_b, mean_b, centred.T @ centred)
+
+    def _merge_moments(self, n_b, mean_b, comoment_b):
+        n_a = self.moment_n
+        n = n_a + n_b
+        delta = mean_b - self.moment_mean
+        self.moment_mean = self.moment_mean + delta * (n_b / n)
+        self.comoment = self.comoment + comoment_b + np.outer(delta, delta) * (n_a * n_b / n)
+        self.moment_n = n
+
+    def _update_top(self, heap, size, chunk, column):
+        # nlargest on the chunk first so only a handful of rows hit the heap
+        for name, value in chunk.nlargest(size, column)[['name', column]].itertuples(index=False):
+            if pd.isna(value):
+                continue
+            item = (value, -next(self._sequence), name)
+            if len(heap) < size:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    # Function to get an independent copy, e.g. to fold appended rows into while
+    # views are still drawing from the original
+    def copy(self):
+        return type(self)(self.top_votes_size, self.top_rated_size).merge(self)
+
+    # Function to combine aggregates built from different chunks or workers
+    def merge(self, other):
+        self.rows += other.rows
+        for column in CATEGORY_COLUMNS:
+            self.counts[column] = self.counts[column].add(other.counts[column], fill_value=0).astype('int64')
+            for value, hist in other.rate_hist_by[column].items():
+                current = self.rate_hist_by[column].get(value)
+                self.rate_hist_by[column][value] = hist.copy() if current is None else current + hist
+        self.rate_hist += other.rate_hist
+        self.cost_hist += other.cost_hist
+        self.price_range += other.price_range
+        self.cuisines = self.cuisines.add(other.cuisines, fill_value=0).astype('int64')
+        if other.moment_n:
+            self._merge_moments(other.moment_n, other.moment_mean, other.comoment)
+        for heap, size, other_heap in ((self.top_votes_heap, self.top_votes_size, other.top_votes_heap),
+                                       (self.top_rated_heap, self.top_rated_size, other.top_rated_heap)):
+            for value, _, name in sorted(other_heap, key=lambda item: item[1], reverse=True):  # Insertion order
+                item = (value, -next(self._sequence), name)
+                if len(heap) < size:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return self
+
+    # Results in the shapes the plot functions want
+
+    def category_counts(self, column):
+        counts = self.counts[column]
+        return counts[counts > 0].sort_values(ascending=False)  # Filtered rows can leave categories empty
+
+    def rate_histogram(self):
+        return RATE_BINS, self.rate_hist
+
+    def cost_histogram(self):
+        return COST_BINS, self.cost_hist
+
+    def price_range_counts(self):
+        return self.price_range.copy()
+
+    def cuisine_frequencies(self):
+        return self.cuisines.sort_values(ascending=False).to_dict()
+
+    def correlation(self):
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.outer(std, std)
+        return pd.DataFrame(corr, index=NUMERIC_COLUMNS, columns=NUMERIC_COLUMNS)
+
+    def _top_frame(self, heap, column):
+        items = sorted(heap, reverse=True)
+        return pd.DataFrame({'name': [name for _, _, name in items],
+                             column: [value for value, _, _ in items]})
+
+    def top_by_votes(self):
+        return self._top_frame(self.top_votes_heap, 'votes')
+
+    def top_rated(self):
+        return self._top_frame(self.top_rated_heap, 'rate')
+
+    def rate_box_stats(self, column):
+        return [box_stats_from_counts(RATE_VALUES, hist, value)
+                for value, hist in sorted(self.rate_hist_by[column].items(), key=lambda kv: str(kv[0]))
+                if hist.sum()]
+
+
+# Function to find the rows that can make a top-`size` list by value: everything
+# above the size-th largest value, plus the first rows tied with it (nlargest
+# keeps the first of equal values). Returns their positions in order.
+def _top_candidates(values, size):
+    present = ~np.isnan(values)
+    if np.count_nonzero(present) <= size:
+        return np.flatnonzero(present)
+    valid = values[present]
+    cutoff = np.partition(valid, len(valid) - size)[len(valid) - size]
+    above = values > cutoff
+    tied = np.flatnonzero(values == cutoff)[:size - np.count_nonzero(above)]
+    return np.union1d(np.flatnonzero(above), tied)
+
+
+# The columns DatasetAggregates reads, as arrays indexed by row position: rate
+# and cost as their histogram bins, cost as its price range, the numeric
+# columns as float64 and each category column combined with the rating bin.
+# Built once per load and extended when rows are appended to the CSV, so a
+# filtered summary only gathers and counts the selected rows.
+class AggregateColumns:
+    def __init__(self, data):
+        self.rows = 0
+        self.numeric = np.zeros((0, len(NUMERIC_COLUMNS)))
+        self.complete = np.zeros(0, dtype=bool)  # Rows with every numeric column, for the correlation
+        self.rate_bins = self.cost_bins = np.zeros(0, dtype=np.int64)
+        # Per category column, code * (rating bins + 1) + rating bin, the extra bin
+        # being for no rating (-1 for no category): one bincount of these gives
+        # each category's row count and its rating histogram
+        self.categories = {column: pd.Index([]) for column in CATEGORY_COLUMNS}
+        self.rate_cells = {column: np.zeros(0, dtype=np.int64) for column in CATEGORY_COLUMNS}
+        self.price_range_codes = np.zeros(0, dtype=np.int8)
+        self.top_rows = data[['name', 'votes', 'rate']].iloc[:0]  # Only read for the few top-N candidates
+        # Cuisine tokens as (row, token code) pairs; None if the CSV has no cuisines column
+        self.cuisines = pd.Index([])
+        self.cuisine_rows = self.cuisine_codes = None
+        if CUISINE_COLUMN in data:
+            self.cuisine_rows = self.cuisine_codes = np.zeros(0, dtype=np.int64)
+        self.append(data)
+
+    # Function to add rows appended after the ones already held. Arrays are
+    # replaced, never modified, so copies taken before stay as they were.
+    def append(self, data):
+        numeric = data[NUMERIC_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.numeric = np.concatenate([self.numeric, numeric])
+        self.complete = np.concatenate([self.complete, ~np.isnan(numeric).any(axis=1)])
+        rate, cost = numeric[:, NUMERIC_COLUMNS.index('rate')], numeric[:, NUMERIC_COLUMNS.index(COST_COLUMN)]
+        rate_bins = _bin_index(rate, RATE_BINS)
+        self.rate_bins = np.concatenate([self.rate_bins, rate_bins])
+        self.cost_bins = np.concatenate([self.cost_bins, _bin_index(cost, COST_BINS)])
+        width = len(RATE_BINS) - 1
+        for column in CATEGORY_COLUMNS:
+            # Values first seen in these rows are added after the known ones, so earlier codes stay valid
+            categorical = pd.Categorical(data[column])
+            categories = self.categories[column]
+            categories = categories.append(categorical.categories.difference(categories, sort=False))
+            codes = np.asarray(categorical.codes, dtype=np.int64)
+            codes = np.where(codes >= 0, categories.get_indexer(categorical.categories)[codes], -1)
+            cells = np.where(codes >= 0, codes * (width + 1) + np.where(rate_bins >= 0, rate_bins, width), -1)
+            self.categories[column] = categories
+            self.rate_cells[column] = np.concatenate([self.rate_cells[column], cells])
+        price_range = pd.cut(data[COST_COLUMN], bins=PRICE_RANGE_BINS, labels=PRICE_RANGE_LABELS)
+        self.price_range_codes = np.concatenate([self.price_range_codes, np.asarray(price_range.cat.codes)])
+        self.top_rows = pd.concat([self.top_rows, data[['name', 'votes', 'rate']]], ignore_index=True)
+        if self.cuisine_rows is not None:
+            tokens = data[CUISINE_COLUMN].reset_index(drop=True).dropna().astype(str).str.split(',').explode().str.strip()
+            tokens = tokens[tokens != '']
+            self.cuisines = self.cuisines.append(pd.Index(tokens.unique()).difference(self.cuisines, sort=False))
+            self.cuisine_rows = np.concatenate([self.cuisine_rows, tokens.index.to_numpy(dtype=np.int64) + self.rows])
+            self.cuisine_codes = np.concatenate([self.cuisine_codes, self.cuisines.get_indexer(tokens)])
+        self.rows += len(data)
+
+    # Function to get an independent copy, e.g. to append rows to while views
+    # are still summarising from the original
+    def copy(self):
+        copied = object.__new__(type(self))
+        copied.__dict__.update(self.__dict__)
+        copied.categories = dict(self.categories)
+        copied.rate_cells = dict(self.rate_cells)
+        return copied
+
+
+OTHERS_LABEL = 'Others'
+
+
+# Function to reduce votes per restaurant name before plotting (no bootstrap CIs).
+# With top_k, only the k largest names are kept and the rest are folded into one
+# "Others" bar, using the same reducer over the remaining per-name values.
+def aggregate_votes_by_name(data, reducer='mean', top_k=None, others=True):
+    per_name = data.groupby('name', sort=False, observed=True)['votes'].agg(reducer)
+    if top_k is None or len(per_name) <= top_k:
+        return per_name
+    keep = top_k - 1 if others else top_k
+    top = per_name.nlargest(keep)
+    if not others:
+        return top
+    rest = per_name.drop(top.index)
+    return pd.concat([top, pd.Series({OTHERS_LABEL: rest.agg(reducer)})])
+
+
+# Memo of computed statistics for one version of the dataset. Every view asks
+# the cache instead of recomputing; a new fingerprint drops everything.
+# Values are computed outside the lock, by the first thread to ask for them;
+# others asking for the same value wait for it, everything else goes straight on.
+class AggregateCache:
+    def __init__(self):
+        self.fingerprint = None
+        self._values = {}  # (fingerprint, name) -> Future holding the value
+        self._lock = threading.Lock()  # Views are rendered on worker threads
+
+    def get(self, name, compute):
+        with self._lock:
+            key = (self.fingerprint, name)
+            future = self._values.get(key)
+            owner = future is None
+            if owner:
+                future = self._values[key] = Future()
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as error:
+                with self._lock:
+                    if self._values.get(key) is future:
+                        del self._values[key]  # Let the next caller try again
+                future.set_exception(error)
+        return future.result()
+
+    def invalidate(self, fingerprint=None):
+        with self._lock:
+            self._values.clear()
+            self.fingerprint = fingerprint
+
+    # Function to move to a new version of the data keeping values already
+    # brought up to date (e.g. the summary after an append); the rest is dropped
+    def advance(self, fingerprint, **values):
+        with self._lock:
+            self._values = {(fingerprint, name): _resolved(value) for name, value in values.items()}
+            self.fingerprint = fingerprint
+
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+# Function to build the aggregates from a CSV in bounded chunks (flat peak memory)
+def stream_aggregates(path=DATA_FILE, chunksize=200_000, end=None):
+    aggregates = DatasetAggregates()
+    for chunk in iter_chunks(path, chunksize=chunksize, end=end):
+        aggregates.update(chunk)
+    return aggregates
@@ -0,0 +1,71 @@
+# Benchmark: time from "chart drawn" to "Pygame surface ready" for the sales
+# dashboard, comparing the old PNG file round-trip with the in-memory buffer.
+#
+#   python benchmarks/bench_figure_transfer.py --repeat 20
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # No window needed
+
+import numpy as np
+import pygame
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import sales_dashboard
+from aggregates import aggregate_votes_by_name
+from data_loader import DATA_FILE, load_data
+
+
+# Old path: savefig to PNG, then pygame.image.load it back
+def png_round_trip(fig, path):
+    fig.savefig(path)
+    return pygame.image.load(path)
+
+
+# New path: wrap the Agg canvas buffer as a surface
+def buffer_transfer(fig, path):
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+    return sales_dashboard.surface_from_rgba(rgba, fig.canvas.get_width_height())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare PNG round-trip and buffer transfer latency')
+    parser.add_argument('--csv', default=os.path.join(ROOT, DATA_FILE))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    data = load_data(args.csv)
+    size = sales_dashboard.PLOT_SIZE
+    dpi = sales_dashboard.PLOT_DPI
+    fig = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    votes = aggregate_votes_by_name(data, top_k=sales_dashboard.lod_bar_count(size[0]))
+    sales_dashboard.draw_sales_votes(fig, votes)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'votes_plot.png')
+        for name, transfer in (('png round-trip', png_round_trip), ('buffer transfer', buffer_transfer)):
+            transfer_times = []
+            frame_times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                fig.canvas.draw()
+                drawn = time.perf_counter()
+                surface = transfer(fig, path)
+                done = time.perf_counter()
+                assert surface.get_size() == fig.canvas.get_width_height()
+                transfer_times.append((done - drawn) * 1000)
+                frame_times.append((done - start) * 1000)
+            print(f'{name:16s} transfer median {statistics.median(transfer_times):8.2f} ms   '
+                  f'frame-ready median {statistics.median(frame_times):8.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# CPU benchmark for the sales dashboard's render loop: the old fixed 60 fps
+# full redraw against the event-driven, dirty-rect loop, with the window idle
+# and while the plot is being dragged (synthetic mouse motion at 60 Hz).
+# Uses SDL's dummy video driver, so real displays pay more per frame than this.
+#
+#   python benchmarks/bench_sales_loop.py --seconds 10
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SCENARIOS = ('idle', 'interactive')
+LOOPS = ('fixed-60fps', 'event-driven')
+
+
+# The main loop as it was before: full clear and redraw every frame at 60 fps
+def fixed_rate_loop(sales_dashboard, pygame):
+    font = pygame.font.SysFont(None, 40)
+    clock = pygame.time.Clock()
+    sales_plot = sales_dashboard.plot_sales_data()
+    while True:
+        sales_dashboard.screen.fill(sales_dashboard.WHITE)
+        sales_dashboard.draw_text('Restaurant Votes Dashboard', font, sales_dashboard.BLACK,
+                                  sales_dashboard.screen, 20, 20)
+        sales_dashboard.screen.blit(sales_plot, (50, 100))
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return
+        pygame.display.update()
+        clock.tick(60)
+
+
+# Function to run one loop for one scenario (in a fresh process) and return its CPU share
+def run_case(loop, scenario, seconds):
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.chdir(ROOT)  # sales_dashboard reads the CSV by its relative name
+    import pygame
+    import sales_dashboard
+
+    sales_dashboard.plot_sales_data()  # Warm the bitmap cache so only the loop is measured
+    if scenario == 'interactive':
+        drag = pygame.event.Event(pygame.MOUSEMOTION, pos=(400, 300), rel=(-4, -1), buttons=(1, 0, 0))
+        pygame.time.set_timer(drag, 16)
+        # Jump back to the start now and then, so the drag never stops at the plot's edge
+        pygame.time.set_timer(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_HOME), 2000)
+    pygame.time.set_timer(pygame.event.Event(pygame.QUIT), int(seconds * 1000), loops=1)
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    start = time.perf_counter()
+    if loop == 'fixed-60fps':
+        fixed_rate_loop(sales_dashboard, pygame)
+    else:
+        sales_dashboard.run()
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu = (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime)
+    pygame.quit()
+    return cpu / wall * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare CPU use of the fixed-rate and event-driven sales loops.')
+    parser.add_argument('--seconds', type=float, default=10.0, help='how long each case runs')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    print(f'{"loop":<14} {"scenario":<12} {"CPU %":>7}')
+    for scenario in SCENARIOS:
+        for loop in LOOPS:
+            with context.Pool(1) as pool:
+                cpu = pool.apply(run_case, (loop, scenario, args.seconds))
+            print(f'{loop:<14} {scenario:<12} {cpu:>7.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# Load test for service.py: sends GET requests to a local service at a fixed
+# rate (open loop, so a slow response doesn't hold back the next request) for
+# a while and reports latency percentiles per path. Latency is measured from
+# when each request was due, so time spent queued behind others counts too.
+# Starts the service itself unless --url points at one already running.
+#
+#   python benchmarks/bench_service.py --qps 200 --seconds 20
+#   python benchmarks/bench_service.py --url http://127.0.0.1:8050 --path /api/types
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Default request mix: mostly cached aggregates and queries, some rendered views
+DEFAULT_PATHS = [
+    '/api/types', '/api/top-rated', '/api/top-voted', '/api/correlation', '/api/price-ranges',
+    '/api/query?q=cheap+places', '/api/query?q=best+restaurants', '/api/query?q=table+reservation',
+    '/render/restaurant_types.png', '/render/correlation_heatmap.png?width=800&height=600',
+]
+
+
+# Keep-alive connections to the service, reused between requests
+class ConnectionPool:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._idle = []
+
+    async def get(self, path):
+        if self._idle:
+            reader, writer = self._idle.pop()
+        else:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n'.encode('latin-1'))
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+        except Exception:
+            writer.close()
+            raise
+        self._idle.append((reader, writer))
+        return status
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+
+
+# Function to fire requests at `qps` for `seconds`, cycling through the paths
+async def run_load(host, port, paths, qps, seconds):
+    pool = ConnectionPool(host, port)
+    results = []
+
+    async def one(path, due):
+        try:
+            status = await pool.get(path)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            status = None
+        results.append((path, status, time.perf_counter() - due))
+
+    loop_start = time.perf_counter()
+    tasks = []
+    for number in range(int(qps * seconds)):
+        due = loop_start + number / qps
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(paths[number % len(paths)], due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - loop_start
+    pool.close()
+    return results, elapsed
+
+
+# Function to wait for a freshly started service to answer /health
+async def wait_until_ready(host, port, timeout):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            if await ConnectionPool(host, port).get('/health') == 200:
+                return
+        except OSError:
+            pass
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f'service on {host}:{port} did not start within {timeout}s')
+        await asyncio.sleep(0.2)
+
+
+def print_report(results, elapsed, qps):
+    print(f'{len(results)} requests in {elapsed:.1f}s ({len(results) / elapsed:.0f}/s, target {qps:g}/s)')
+    print(f'{"path":<52} {"count":>6} {"errors":>6} {"p50 ms":>8} {"p99 ms":>8} {"max ms":>8}')
+    by_path = {}
+    for path, status, latency in results:
+        by_path.setdefault(path, []).append((status, latency))
+    rows = sorted(by_path.items()) + [('all', [(status, latency) for _, status, latency in results])]
+    for path, entries in rows:
+        latencies = np.array([latency for _, latency in entries]) * 1000
+        errors = sum(status != 200 for status, _ in entries)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f'{path:<52} {len(entries):>6} {errors:>6} {p50:>8.1f} {p99:>8.1f} {latencies.max():>8.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report service latency percentiles at a target request rate.')
+    parser.add_argument('--url', help='service to test (default: start one on --port)')
+    parser.add_argument('--port', type=int, default=8051)
+    parser.add_argument('--csv', help='CSV for the started service (default: the repo dataset)')
+    parser.add_argument('--rows', type=int, help='serve synthetic data with this many rows instead')
+    parser.add_argument('--qps', type=float, default=200.0)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--warmup', type=float, default=2.0, help='seconds of load before measuring')
+    parser.add_argument('--path', action='append', dest='paths', help='path to request (repeatable)')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'zomato_bench'))
+    args = parser.parse_args()
+    paths = args.paths or DEFAULT_PATHS
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port
+    else:
+        host, port = '127.0.0.1', args.port
+        command = [sys.executable, os.path.join(ROOT, 'service.py'), '--host', host, '--port', str(port)]
+        if args.rows:
+            from synthetic_data import ensure_csv
+            command += ['--csv', ensure_csv(args.data_dir, args.rows)]
+        elif args.csv:
+            command += ['--csv', args.csv]
+        server = subprocess.Popen(command, cwd=ROOT)
+
+    try:
+        asyncio.run(wait_until_ready(host, port, timeout=300))
+        if args.warmup:
+            asyncio.run(run_load(host, port, paths, args.qps, args.warmup))
+        results, elapsed = asyncio.run(run_load(host, port, paths, args.qps, args.seconds))
+        print_report(results, elapsed, args.qps)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
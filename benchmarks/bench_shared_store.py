@@ -0,0 +1,97 @@
+# Memory benchmark for the shared columnar store: starts N processes that all
+# load the same CSV at once, first with private copies (Arrow cache), then
+# attached to the shared store, and reports attach time and per-process memory.
+# PSS splits shared pages between the processes that map them, so the PSS
+# total is what the whole group really costs. Linux only (reads /proc).
+#
+#   python benchmarks/bench_shared_store.py --rows 1000000 --processes 8
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+# Function to read this process's memory from /proc/self/smaps_rollup, in MB
+def memory_mb():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as handle:
+        for line in handle:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {'rss': fields['Rss'], 'pss': fields['Pss'],
+            'private': fields['Private_Clean'] + fields['Private_Dirty']}
+
+
+# Function run in each process: load, touch every column, wait for the others, measure
+def worker(csv_path, shared, barrier, results):
+    os.environ['ZOMATO_SHARED_STORE'] = '1' if shared else '0'
+    import numpy as np
+    import pandas as pd
+    from data_loader import load_data
+
+    baseline = memory_mb()
+    start = time.perf_counter()
+    data = load_data(csv_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    for column in data.columns:  # Fault every page in, like drawing the views would
+        values = data[column].array
+        if hasattr(values, 'codes'):
+            np.asarray(values.codes).sum()
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            values.to_numpy(dtype=np.float64, na_value=np.nan).sum()  # The copy is freed right after
+    barrier.wait()
+    memory = memory_mb()
+    results.put({'load_ms': load_ms, **{key: memory[key] - baseline[key] for key in memory}})
+    barrier.wait()
+
+
+# Function to run one mode with N concurrent processes and average the results
+def run_mode(csv_path, shared, processes):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(processes)
+    results = context.Queue()
+    workers = [context.Process(target=worker, args=(csv_path, shared, barrier, results)) for _ in range(processes)]
+    for process in workers:
+        process.start()
+    rows = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare private and shared-store loading across processes.')
+    parser.add_argument('--csv', help='CSV to load (default: synthetic data)')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='synthetic rows when --csv is not given')
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'zomato_bench'))
+    args = parser.parse_args()
+
+    if args.csv:
+        csv_path = args.csv
+    else:
+        from synthetic_data import ensure_csv
+        csv_path = ensure_csv(args.data_dir, args.rows)
+
+    # Build the Arrow cache and the shared store up front, so both modes only load
+    for shared in (False, True):
+        run_mode(csv_path, shared, 1)
+
+    print(f'{args.processes} processes loading {csv_path}')
+    print(f'{"mode":<8} {"load ms":>9} {"RSS MB":>9} {"PSS MB":>9} {"private MB":>11} {"PSS total":>10}')
+    for shared in (False, True):
+        rows = run_mode(csv_path, shared, args.processes)
+        mean = {key: sum(row[key] for row in rows) / len(rows) for key in rows[0]}
+        print(f'{"shared" if shared else "private":<8} {mean["load_ms"]:>9.1f} {mean["rss"]:>9.1f} '
+              f'{mean["pss"]:>9.1f} {mean["private"]:>11.1f} {mean["pss"] * len(rows):>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
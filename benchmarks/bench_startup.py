@@ -0,0 +1,92 @@
+# Startup benchmark for dashboard.py.
+#
+# 1. Import cost: runs the dashboard's module-level imports under `-X importtime`
+#    and fails if they exceed the budget (catches a heavy import sneaking back
+#    to the top of the file).
+# 2. Time to first paint / data ready: launches the dashboard with
+#    ZOMATO_STARTUP_PROBE=1 and times the probe lines (needs a display).
+#
+#   python benchmarks/bench_startup.py --repeat 5
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD = os.path.join(ROOT, 'dashboard.py')
+
+
+# Function to collect the imports dashboard.py runs before the window opens
+def module_level_imports(path=DASHBOARD):
+    with open(path, encoding='utf-8') as handle:
+        tree = ast.parse(handle.read())
+    statements = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return '\n'.join(ast.unparse(node) for node in statements)
+
+
+# Function to time the imports once; returns total ms and the top-level modules by cost
+def measure_imports(code):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name[1:].startswith(' '):  # Top level only, nested imports are already included
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sum(ms for ms, _ in modules), sorted(modules, reverse=True)
+
+
+# Function to launch the dashboard and time the startup probe lines
+def measure_first_paint(timeout):
+    env = dict(os.environ, ZOMATO_STARTUP_PROBE='1')
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, DASHBOARD], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    marks = {}
+    try:
+        for line in process.stdout:
+            marks[line.strip()] = (time.perf_counter() - start) * 1000
+            if line.strip() == 'data-ready':
+                break
+        process.wait(timeout=timeout)
+    finally:
+        process.kill()
+    return marks.get('first-paint'), marks.get('data-ready')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Guard dashboard import time and time to first paint')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=300.0)
+    parser.add_argument('--paint-budget-ms', type=float, default=1500.0)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    code = module_level_imports()
+    runs = [measure_imports(code) for _ in range(args.repeat)]
+    import_ms = statistics.median(total for total, _ in runs)
+    print(f'module-level imports: median {import_ms:.1f} ms over {args.repeat} runs')
+    for ms, name in runs[-1][1][:5]:
+        print(f'  {ms:8.1f} ms  {name}')
+
+    has_display = sys.platform in ('win32', 'darwin') or os.environ.get('DISPLAY')
+    if has_display:
+        marks = [measure_first_paint(args.timeout) for _ in range(args.repeat)]
+        assert all(paint is not None and ready is not None for paint, ready in marks), 'dashboard never reported startup'
+        paint_ms = statistics.median(paint for paint, _ in marks)
+        ready_ms = statistics.median(ready for _, ready in marks)
+        print(f'first paint: median {paint_ms:.0f} ms, data ready: median {ready_ms:.0f} ms')
+        assert paint_ms <= args.paint_budget_ms, f'first paint took {paint_ms:.0f} ms'
+    else:
+        print('no display, skipping the first-paint measurement')
+
+    assert import_ms <= args.import_budget_ms, f'module-level imports took {import_ms:.1f} ms'
+
+
+if __name__ == '__main__':
+    main()
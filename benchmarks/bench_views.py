@@ -0,0 +1,184 @@
+# Scaling benchmark for every dashboard view and the sales chart, on synthetic
+# data from 10^3 to 10^7 rows. Load, aggregation, drawing and rasterization are
+# timed separately, with peak memory, and written to JSON so runs from
+# different commits can be compared.
+#
+#   python benchmarks/bench_views.py --tiers 1000 100000 1000000 --out bench.json
+#   python benchmarks/bench_views.py --compare bench_old.json --out bench_new.json
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_TIERS = [1_000, 10_000, 100_000, 1_000_000]
+
+
+# Function to time a stage (best of `repeat`) and, if asked, run it again under
+# tracemalloc for its peak memory
+def measure(stage, memory, repeat=1):
+    elapsed_ms = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = stage()
+        elapsed_ms = min(elapsed_ms, (time.perf_counter() - start) * 1000)
+    peak_mb = None
+    if memory:
+        tracemalloc.start()
+        stage()
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    return result, elapsed_ms, peak_mb
+
+
+# Function to read this process's peak RSS in MB
+def peak_rss_mb():
+    import resource
+    scale = 2 ** 20 if sys.platform == 'darwin' else 2 ** 10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+# Function to benchmark one row-count tier (runs in a fresh process so peak RSS is per tier)
+def run_tier(rows, data_dir, memory, view_filter, repeat=1):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import matplotlib
+    matplotlib.use('Agg')
+
+    from aggregates import DatasetAggregates, aggregate_votes_by_name, stream_aggregates
+    from data_loader import load_data
+    from render_engine import new_figure
+    from synthetic_data import ensure_csv
+    from views import QUERY_VIEWS, SIDEBAR_VIEWS
+
+    csv_path = ensure_csv(data_dir, rows)
+    result = {'rows': rows, 'csv_mb': os.path.getsize(csv_path) / 2 ** 20, 'views': {}}
+
+    data, parse_ms, parse_peak = measure(lambda: load_data(csv_path, use_cache=False), memory, repeat)
+    load_data(csv_path)  # Builds the Arrow cache
+    _, cached_ms, cached_peak = measure(lambda: load_data(csv_path), memory, repeat)
+    result['load'] = {'csv_ms': parse_ms, 'csv_peak_mb': parse_peak,
+                      'cached_ms': cached_ms, 'cached_peak_mb': cached_peak}
+
+    summary, aggregate_ms, aggregate_peak = measure(lambda: DatasetAggregates.from_frame(data), memory, repeat)
+    _, stream_ms, stream_peak = measure(lambda: stream_aggregates(csv_path), memory, repeat)
+    result['aggregate'] = {'ms': aggregate_ms, 'peak_mb': aggregate_peak,
+                           'stream_ms': stream_ms, 'stream_peak_mb': stream_peak}
+
+    views = {name: view for name, view in SIDEBAR_VIEWS.items()}
+    views.update({f'Query - {name}': view for name, view in QUERY_VIEWS.items()})
+    try:
+        import sales_dashboard
+
+        def draw_sales(fig, summary, data):
+            votes = aggregate_votes_by_name(data, top_k=sales_dashboard.lod_bar_count(sales_dashboard.PLOT_SIZE[0]))
+            sales_dashboard.draw_sales_votes(fig, votes)
+        views['Sales - votes for restaurants'] = (draw_sales, (15, 8))
+    except ImportError:
+        pass
+
+    for name, (draw, figsize) in views.items():
+        if view_filter and not any(part.lower() in name.lower() for part in view_filter):
+            continue
+        fig = new_figure(figsize=figsize)
+
+        def draw_view():
+            fig.clear()
+            draw(fig, summary, data)
+
+        _, draw_ms, draw_peak = measure(draw_view, memory, repeat)
+        _, raster_ms, raster_peak = measure(fig.canvas.draw, memory, repeat)
+        result['views'][name] = {'draw_ms': draw_ms, 'draw_peak_mb': draw_peak,
+                                 'raster_ms': raster_ms, 'raster_peak_mb': raster_peak}
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+# Function to describe the environment so results can be matched to a commit
+def run_metadata():
+    import matplotlib
+    import numpy
+    import pandas
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+# Function to flatten a result file into {metric path: value} for comparisons
+def flatten(tree, prefix=''):
+    flat = {}
+    for key, value in tree.items():
+        path = f'{prefix}/{key}' if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and path.endswith(('ms', 'mb')):
+            flat[path] = value
+    return flat
+
+
+# Function to print how the new run compares with an older result file
+def print_comparison(old, new, threshold=1.10):
+    old_flat, new_flat = flatten(old['tiers']), flatten(new['tiers'])
+    print(f"\ncompared with {old['meta'].get('commit')}:")
+    for path in sorted(set(old_flat) & set(new_flat)):
+        if not old_flat[path]:
+            continue
+        ratio = new_flat[path] / old_flat[path]
+        flag = '  REGRESSION' if ratio > threshold else ''
+        print(f'  {path:70s} {old_flat[path]:10.1f} -> {new_flat[path]:10.1f}  x{ratio:5.2f}{flag}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every view across synthetic data sizes')
+    parser.add_argument('--tiers', type=int, nargs='+', default=DEFAULT_TIERS)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'zomato_bench'))
+    parser.add_argument('--views', nargs='*', help='only views whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per stage, the fastest is kept')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc passes')
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', help='earlier result file to compare against')
+    args = parser.parse_args()
+
+    results = {'meta': run_metadata(), 'tiers': {}}
+    context = multiprocessing.get_context('spawn')
+    for rows in args.tiers:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            tier = executor.submit(run_tier, rows, args.data_dir, not args.no_memory, args.views, args.repeat).result()
+        results['tiers'][str(rows)] = tier
+        print(f"\n{rows:>10,d} rows  load {tier['load']['csv_ms']:8.0f} ms (cached {tier['load']['cached_ms']:6.0f} ms)  "
+              f"aggregate {tier['aggregate']['ms']:7.0f} ms  peak RSS {tier['peak_rss_mb']:7.0f} MB")
+        for name, view in tier['views'].items():
+            print(f"  {name:40s} draw {view['draw_ms']:8.1f} ms  raster {view['raster_ms']:8.1f} ms")
+
+    with open(args.out, 'w') as handle:
+        json.dump(results, handle, indent=2)
+    print(f'\nresults written to {args.out}')
+
+    if args.compare:
+        with open(args.compare) as handle:
+            print_comparison(json.load(handle), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# Soak test for the dashboard's view switching: loads dashboard.py against a
+# withdrawn Tk root and clicks through every sidebar option (and a query on the
+# Data Query page) thousands of times, the same way the buttons do. Checks that
+# RSS, Tk widgets, PhotoImages and figures all stay flat after warmup.
+# Needs a display; on a headless machine run it under xvfb-run.
+#
+#   python benchmarks/soak_views.py --cycles 200
+import argparse
+import gc
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# One query per intent, typed into the Data Query page after it opens
+QUERIES = ['best restaurants', 'online delivery', 'cheap places', 'cuisine category',
+           'rating score', 'popular likes', 'area', 'table reservation']
+
+
+# Function to read the current resident set size in MB
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except OSError:
+        import resource  # No /proc (macOS): fall back to the peak RSS
+        scale = 2 ** 20 if sys.platform == 'darwin' else 2 ** 10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+# Function to count every live widget under a Tk widget
+def count_widgets(widget):
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+# Function to run the Tk event loop until the background renders have been shown
+def settle(dashboard, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while dashboard.render_engine.pending() or not dashboard.data_ready:
+        if time.perf_counter() > deadline:
+            raise TimeoutError('dashboard did not finish rendering')
+        dashboard.root.update()
+        time.sleep(0.002)
+    dashboard.root.update()
+
+
+# Function to click one sidebar option (and on the query page, run a query)
+def click(dashboard, option, query):
+    dashboard.option_var.set(option)
+    settle(dashboard)
+    if option == 'Data Query':
+        dashboard.process_query(query)
+        settle(dashboard)
+
+
+def snapshot(dashboard, plt):
+    return {'rss': rss_mb(),
+            'widgets': count_widgets(dashboard.root),
+            'photos': len(dashboard.root.tk.call('image', 'names')),
+            'pooled': len(dashboard.figure_pool),
+            'pyplot': len(plt.get_fignums())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soak test for dashboard view switching')
+    parser.add_argument('--csv', help='CSV to load (default: the repo dataset)')
+    parser.add_argument('--cycles', type=int, default=200, help='passes over every option')
+    parser.add_argument('--warmup', type=int, default=5, help='passes before the baseline is taken')
+    parser.add_argument('--keep-bitmaps', action='store_true',
+                        help='let the bitmap cache answer repeat clicks (default: re-render every click)')
+    parser.add_argument('--max-growth-mb', type=float, default=25.0)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    if args.csv:
+        import data_loader
+        data_loader.DATA_FILE = os.path.abspath(args.csv)
+    import matplotlib.pyplot as plt
+    import dashboard  # Builds the window and starts loading; the main loop is ours to run
+
+    dashboard.root.withdraw()
+    settle(dashboard, timeout=300)
+
+    baseline = None
+    clicks = 0
+    start = time.perf_counter()
+    for cycle in range(args.warmup + args.cycles):
+        if not args.keep_bitmaps:
+            dashboard.bitmap_cache.clear()
+        for option in dashboard.options:
+            click(dashboard, option, QUERIES[cycle % len(QUERIES)])
+            clicks += 1
+            if cycle == args.warmup and option == dashboard.options[0]:
+                gc.collect()
+                baseline = snapshot(dashboard, plt)  # Measured on the first view, like the final one
+        if cycle % 50 == 0:
+            current = snapshot(dashboard, plt)
+            print(f'cycle {cycle:5d}  clicks {clicks:6d}  rss {current["rss"]:7.1f} MB  '
+                  f'widgets {current["widgets"]:4d}  photo images {current["photos"]:3d}  '
+                  f'pooled figures {current["pooled"]}  pyplot figures {current["pyplot"]}')
+
+    click(dashboard, dashboard.options[0], QUERIES[0])
+    gc.collect()
+    final = snapshot(dashboard, plt)
+    growth = final['rss'] - baseline['rss']
+    elapsed = time.perf_counter() - start
+    print(f'{clicks} clicks in {elapsed:.1f}s, RSS growth after warmup {growth:.1f} MB')
+    dashboard.on_close()
+
+    assert final['pyplot'] == 0, 'views leaked pyplot figures'
+    # One figure per pane (main, result) on each of the two render workers
+    assert final['pooled'] <= 4, f'figure pool grew to {final["pooled"]} figures'
+    assert final['widgets'] <= baseline['widgets'], f'Tk widgets grew from {baseline["widgets"]} to {final["widgets"]}'
+    assert final['photos'] <= baseline['photos'], f'PhotoImages grew from {baseline["photos"]} to {final["photos"]}'
+    assert growth <= args.max_growth_mb, f'RSS grew by {growth:.1f} MB'
+
+
+if __name__ == '__main__':
+    main()
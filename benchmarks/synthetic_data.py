@@ -0,0 +1,81 @@
+# Synthetic Zomato data with the same columns and formats as "Zomato data .csv":
+# "x.y/5" rate strings, Yes/No flags, skewed restaurant types and heavy-tailed votes.
+#
+#   python benchmarks/synthetic_data.py --rows 1000000 --out /tmp/zomato_1m.csv
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['name', 'online_order', 'book_table', 'rate', 'votes',
+           'approx_cost(for two people)', 'listed_in(type)']
+
+# Category mix taken from the sample file (110 / 23 / 8 / 7 of 148 rows)
+TYPE_SHARES = {'Dining': 0.74, 'Cafes': 0.16, 'other': 0.055, 'Buffet': 0.045}
+ONLINE_SHARE = 0.39
+BOOK_TABLE_SHARE = 0.05
+
+
+# Function to generate one block of rows; the same seed always gives the same data
+def generate_rows(rows, seed=0, name_pool=None):
+    rng = np.random.default_rng(seed)
+    if name_pool is None:
+        name_pool = max(10, int(rows * 0.9))
+
+    # Chains repeat a lot and most places appear once: Zipf-ish name ids
+    name_ids = np.minimum(rng.zipf(1.3, rows), name_pool) - 1
+    names = np.char.add('Restaurant ', name_ids.astype(str))
+
+    rate = np.clip(np.round(rng.normal(3.6, 0.4, rows), 1), 1.0, 5.0)
+    rate_text = pd.Series(np.char.add(np.char.mod('%.1f', rate), '/5'))
+    spaced = rng.random(rows) < 0.01  # The sample has the odd "3.8 /5"
+    rate_text[spaced] = rate_text[spaced].str.replace('/5', ' /5', regex=False)
+
+    votes = np.minimum(np.floor(rng.pareto(1.1, rows) * 20), 20_000).astype(np.int64)
+    votes[rng.random(rows) < 0.1] = 0
+    cost = (np.clip(np.round(rng.lognormal(np.log(400), 0.5, rows) / 50) * 50, 100, 6000)).astype(np.int64)
+
+    types = rng.choice(list(TYPE_SHARES), size=rows, p=list(TYPE_SHARES.values()))
+    return pd.DataFrame({
+        'name': names,
+        'online_order': np.where(rng.random(rows) < ONLINE_SHARE, 'Yes', 'No'),
+        'book_table': np.where(rng.random(rows) < BOOK_TABLE_SHARE, 'Yes', 'No'),
+        'rate': rate_text,
+        'votes': votes,
+        'approx_cost(for two people)': cost,
+        'listed_in(type)': types,
+    }, columns=COLUMNS)
+
+
+# Function to write a synthetic CSV in blocks so 10^7 rows don't need 10^7 rows of RAM
+def write_csv(path, rows, seed=0, block_rows=1_000_000):
+    name_pool = max(10, int(rows * 0.9))
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        for block, start in enumerate(range(0, rows, block_rows)):
+            block = generate_rows(min(block_rows, rows - start), seed=seed + block, name_pool=name_pool)
+            block.to_csv(handle, index=False, header=start == 0)
+    return path
+
+
+# Function to get a cached synthetic CSV for a row count, generating it if needed
+def ensure_csv(folder, rows, seed=0):
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f'zomato_synthetic_{rows}_{seed}.csv')
+    if not os.path.exists(path):
+        write_csv(path + '.tmp', rows, seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate schema-faithful synthetic Zomato data')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+    write_csv(args.out, args.rows, args.seed)
+
+
+if __name__ == '__main__':
+    main()
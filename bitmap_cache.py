@@ -0,0 +1,116 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+# LRU cache of rendered RGBA bitmaps keyed by (view, data fingerprint, size, dpi).
+# Entries are evicted least-recently-used first once the memory budget is hit.
+# With a cache_dir the bitmaps are also kept on disk as raw .npy files, so a
+# fresh process can memory-map them instead of rendering again.
+class BitmapCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET, cache_dir=None):
+        self.budget_bytes = budget_bytes
+        self.cache_dir = cache_dir
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(view, fingerprint, size, dpi):
+        return (view, fingerprint, int(size[0]), int(size[1]), int(dpi))
+
+    def get(self, key):
+        with self._lock:
+            rgba = self._entries.get(key)
+            if rgba is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rgba
+        rgba = self._load(key)
+        with self._lock:
+            if rgba is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, rgba)
+        return rgba
+
+    def put(self, key, rgba):
+        rgba.setflags(write=False)  # Shared between callers, nobody may draw into it
+        with self._lock:
+            self._store(key, rgba)
+        self._save(key, rgba)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _store(self, key, rgba):
+        if rgba.nbytes > self.budget_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self._entries[key] = rgba
+        self.nbytes += rgba.nbytes
+        while self.nbytes > self.budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    # On-disk tier
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{digest}.npy')
+
+    def _load(self, key):
+        if self.cache_dir is None:
+            return None
+        import numpy as np
+
+        path = self._path(key)
+        try:
+            rgba = np.load(path, mmap_mode='r')
+            os.utime(path)  # Keeps the disk tier in LRU order too
+            return rgba
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, rgba):
+        if self.cache_dir is None:
+            return
+        import numpy as np
+
+        path = self._path(key)
+        tmp_path = f'{path}.tmp{os.getpid()}'
+        try:
+            with open(tmp_path, 'wb') as handle:
+                np.save(handle, rgba)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except OSError:
+            pass  # Disk cache is best effort
+
+    def _prune_disk(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npy'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.budget_bytes:
+                break
+            os.remove(path)
+            total -= size
@@ -1,22 +1,105 @@
 import tkinter as tk
 from tkinter import ttk
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
-from wordcloud import WordCloud
-import numpy as np
-import re
-from fuzzywuzzy import fuzz
+import os
+import threading
+from PIL import Image, ImageTk
 from tkinter import font as tkfont
-
-# Load the data
-df = pd.read_csv('Zomato data .csv')
-print(df.head())  # Add this line to check if data is loaded
-print(df.columns)  # This will show us what columns are actually in the dataset
-
-# Convert 'rate' column to float
-df['rate'] = df['rate'].apply(lambda x: float(str(x).split('/')[0]) if isinstance(x, str) else x)
+from bitmap_cache import BitmapCache
+from instrumentation import profiler
+from render_engine import DPI, FigurePool, RenderEngine, render_rgba
+
+# pandas, seaborn and matplotlib are only imported by load_dataset(), which runs
+# in the background after the window is up. Until then these stay None.
+aggregate_cache = None  # Statistics shared by all views, one set per version of the CSV
+source = None  # Snapshot of the CSV as last loaded, to spot appended rows
+views = None
+df = None
+filter_index = None  # Bitmaps over df's rows for the filter bar (None in streaming mode)
+aggregate_columns = None  # df's columns as arrays, for filtered summaries (None in streaming mode)
+data_ready = False
+active_filters = {}  # {filter dimension: [values]} picked in the filter bar
+load_lock = threading.Lock()  # One load at a time: two would both append the same new rows
+
+# Function to (re)load the data when the CSV has changed. Rows appended to the
+# CSV since the last load are parsed on their own and folded into the frame and
+# the summary; only a rewritten file is loaded again from scratch.
+# In streaming mode no rows are kept and views draw from the aggregates only.
+@profiler.timed('load', category='stage')
+def load_dataset():
+    with load_lock:
+        return _load_dataset()
+
+def _load_dataset():
+    global df, filter_index, aggregate_columns, aggregate_cache, views, source
+    from aggregates import AggregateCache, AggregateColumns
+    from data_loader import APPENDED, DATA_FILE, UNCHANGED, SourceSnapshot, append_rows, load_data, should_stream
+    from filter_index import FilterIndex
+
+    if aggregate_cache is None:
+        aggregate_cache = AggregateCache()
+    current = SourceSnapshot(DATA_FILE)
+    change = source.change_to(current) if source is not None else None
+    if change == APPENDED:
+        summary = get_summary().copy()  # Views may still be drawing from the old one
+        new_rows = []
+        for chunk in source.iter_appended(current):
+            summary.update(chunk)
+            if df is not None:
+                new_rows.append(chunk)
+        if new_rows:
+            index, columns = filter_index.copy(), aggregate_columns.copy()  # Views may still be using the old ones
+            for chunk in new_rows:
+                index.append(chunk)
+                columns.append(chunk)
+            # The index goes last: whoever sees its new rows also sees them in df and the columns
+            df, aggregate_columns, filter_index = append_rows(df, new_rows), columns, index
+        aggregate_cache.advance(current.fingerprint, summary=summary)
+        current = current.complete_lines()  # A row still being written is read next time
+    elif change != UNCHANGED:
+        if should_stream(DATA_FILE):
+            df, aggregate_columns, filter_index = None, None, None
+        else:
+            data = load_data(snapshot=current)  # Typed columns, 'rate' already parsed to float
+            df, aggregate_columns, filter_index = data, AggregateColumns(data), FilterIndex(data)
+        aggregate_cache.invalidate(current.fingerprint)
+    if change != UNCHANGED:
+        source = current
+    get_summary()
+    # Plotting code pulls in seaborn, which is slow to import, so do it here too
+    import views as view_module
+    views = view_module
+    return change != UNCHANGED
+
+# Function to get the aggregates every view draws from, for the rows matching
+# `filters` (all rows by default). Each filter combination is computed once.
+def get_summary(filters=None):
+    from aggregates import DatasetAggregates, stream_aggregates
+    from data_loader import DATA_FILE
+    from filter_index import filter_key
+
+    if df is None:
+        return aggregate_cache.get('summary', lambda: stream_aggregates(DATA_FILE, end=source.end))
+    key = filter_key(filters or {})
+    if key:
+        return aggregate_cache.get(('summary', key), lambda: get_filtered_summary(filters))
+    return aggregate_cache.get('summary', lambda: DatasetAggregates.from_frame(df))
+
+# Function to count the aggregates of the rows matching `filters` straight from
+# the column arrays, without copying the rows. The index is read first: columns
+# set along with it (or after) hold all of its rows.
+def get_filtered_summary(filters):
+    from aggregates import DatasetAggregates
+
+    positions = filter_index.positions(filters)
+    return DatasetAggregates.from_positions(aggregate_columns, positions)
+
+# Function to get the rows matching `filters`, optionally just some columns of
+# them; with no filters this is df itself, not a copy
+def get_rows(filters=None, columns=None):
+    positions = filter_index.positions(filters or {})
+    if positions is None:
+        return df
+    return (df if columns is None else df[columns]).take(positions)
 
 # Create the main window
 root = tk.Tk()
@@ -55,6 +138,7 @@ options = [
     'Data Query'
 ]
 option_var = tk.StringVar(value=options[0])
+option_var.trace_add('write', lambda *args: update_content())
 
 for option in options:
     button = tk.Button(sidebar, text=option, font=sidebar_font, bg='#2c3e50', fg='white',
@@ -68,163 +152,202 @@ for option in options:
 # Add a refresh button
 refresh_button = tk.Button(sidebar, text="Refresh Data", font=sidebar_font, bg='#2c3e50', fg='white',
                            activebackground='#3498db', activeforeground='white', bd=0,
-                           command=lambda: update_content(),
+                           command=lambda: refresh_data(),
                            width=20, height=2, relief=tk.RAISED, borderwidth=2,
                            highlightthickness=2, highlightbackground='#1f2c38',
                            highlightcolor='#3498db')
 refresh_button.pack(side='bottom', pady=20, padx=10, fill='x')
 
+# Filter bar above the charts, filled in by build_filter_bar() once the data is in
+filter_bar = tk.Frame(content_area, bg='#ecf0f1')
+filter_bar.pack(side='top', fill='x')
+filter_vars = {}
+
 # Create main content frame
 main_content = tk.Frame(content_area, bg='white')
 main_content.pack(side='right', fill='both', expand=True)
 
+# One persistent image label (and PhotoImage) per pane, reused by every render
+pane_displays = {}
+
+# Function to get the image label for a pane, creating it the first time
+def get_display(frame):
+    for stale in [f for f, display in pane_displays.items() if not display.winfo_exists()]:
+        del pane_displays[stale]  # Its pane was destroyed (e.g. the old query page)
+    if frame not in pane_displays:
+        display = tk.Label(frame, bg='white')
+        display.photo = None
+        pane_displays[frame] = display
+    return pane_displays[frame]
+
+# Function to clear a frame, keeping its image label around for the next render
+def clear_frame(frame):
+    for widget in frame.winfo_children():
+        if widget is pane_displays.get(frame):
+            widget.pack_forget()
+        else:
+            widget.destroy()
+
 # Function to clear the main content area
 def clear_content():
-    for widget in main_content.winfo_children():
-        widget.destroy()
+    clear_frame(main_content)
+
+# Background renderer: aggregation and Agg rasterization run off the Tk thread,
+# each pane redraws into the same pooled figures
+render_engine = RenderEngine(root)
+figure_pool = FigurePool()
+
+# Rendered views, so going back to a view already seen skips seaborn and Agg
+BITMAP_CACHE_BYTES = 256 * 1024 * 1024
+bitmap_cache = BitmapCache(BITMAP_CACHE_BYTES)
+
+# Function to work out the bitmap size for a view so it fills the content pane
+def view_size(figsize, padding):
+    width = main_content.winfo_width() - 2 * padding
+    height = main_content.winfo_height() - 2 * padding
+    if width <= 1 or height <= 1:  # Not laid out yet
+        return int(figsize[0] * DPI), int(figsize[1] * DPI)
+    return width, min(height, int(width * figsize[1] / figsize[0]))
+
+# Function to show a rendered RGBA bitmap in a frame
+def show_bitmap(frame, rgba, padding):
+    height, width = rgba.shape[:2]
+    image = Image.frombuffer('RGBA', (width, height), rgba, 'raw', 'RGBA', 0, 1)
+    display = get_display(frame)
+    if display.photo is not None and (display.photo.width(), display.photo.height()) == image.size:
+        display.photo.paste(image)  # Same size: update the existing PhotoImage in place
+    else:
+        display.photo = ImageTk.PhotoImage(image)  # Keep a reference or Tk drops the image
+        display.config(image=display.photo)
+    display.pack(fill='both', expand=True, padx=padding, pady=padding)
+
+# Function to render a view in the background and show it in `frame` when done.
+# A newer request (another sidebar click, another query) replaces this one.
+def show_view(frame, draw, figsize, padding=20, explanation=None):
+    from filter_index import filter_key
+
+    filters = dict(active_filters)
+    index = filter_index  # Set by load_dataset(), so the Tk thread never waits on a worker for it
+    if index is not None and index.count(filters) == 0:
+        tk.Label(frame, text="No restaurants match the selected filters", bg='white', font=("Arial", 12)).pack(pady=20)
+        return
+    size = view_size(figsize, padding)
+    view = draw.__name__
+    key = BitmapCache.make_key(view, (aggregate_cache.fingerprint, filter_key(filters)), size, DPI)
+    cached = bitmap_cache.get(key)
+    if cached is not None:
+        render_engine.cancel('content')
+        with profiler.span('blit', view=view, cached=True):
+            show_bitmap(frame, cached, padding)
+        update_overlay(view)
+        if explanation:
+            tk.Label(frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+        return
+
+    loading = tk.Label(frame, text="Loading...", bg='white', font=("Arial", 12))
+    loading.pack(pady=20)
+    pane = 'main' if frame is main_content else 'result'
+
+    def job(superseded):
+        with profiler.span('aggregate', view=view):
+            summary = get_summary(filters)
+            # Row-level views get the matching rows too, as a copy of just the
+            # columns they plot
+            data = get_rows(filters, views.ROW_COLUMNS) if filters and draw in views.NEEDS_ROWS else df
+        return render_rgba(lambda fig: draw(fig, summary, data), size,
+                           superseded=superseded, pool=figure_pool, pane=pane, view=view)
+
+    def done(rgba):
+        bitmap_cache.put(key, rgba)
+        if not frame.winfo_exists():
+            return
+        loading.destroy()
+        with profiler.span('blit', view=view, cached=False):
+            show_bitmap(frame, rgba, padding)
+        update_overlay(view)
+        if explanation:
+            tk.Label(frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+
+    def failed(error):
+        if frame.winfo_exists():
+            loading.config(text=f"Could not draw this view: {error}")
+
+    render_engine.submit('content', job, done, failed)
 
 # Function to plot restaurant types
+@profiler.timed()
 def plot_restaurant_types():
     clear_content()
-    fig, ax = plt.subplots(figsize=(10, 6))
-    restaurant_counts = df['listed_in(type)'].value_counts()
-    plt.pie(restaurant_counts, labels=restaurant_counts.index, autopct='%1.1f%%', startangle=140)
-    plt.title("Distribution of Restaurant Types")
-    plt.axis('equal')
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Restaurant Types'])
 
 # Function to plot votes distribution
+@profiler.timed()
 def plot_votes_distribution():
     clear_content()
-    fig, ax = plt.subplots(figsize=(12, 6))
-    df_sorted = df.sort_values(by='votes', ascending=False).head(20)
-    sns.barplot(x='name', y='votes', data=df_sorted, ax=ax)
-    ax.set_title('Top 20 Restaurants by Votes')
-    ax.set_xlabel('Restaurant Name')
-    ax.set_ylabel('Votes')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Votes Distribution'])
 
 # Function to plot rating distribution
+@profiler.timed()
 def plot_rating_distribution():
     clear_content()
-    fig, ax = plt.subplots(figsize=(10, 6))
-    plt.hist(df['rate'], bins=20)
-    plt.title("Ratings Distribution")
-    plt.xlabel("Rating")
-    plt.ylabel("Frequency")
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Rating Distribution'])
 
 # Function to plot online vs offline orders
+@profiler.timed()
 def plot_online_vs_offline():
     clear_content()
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.boxplot(x='online_order', y='rate', data=df, ax=ax)
-    ax.set_title('Online vs Offline Orders - Ratings')
-    ax.set_xlabel('Online Order')
-    ax.set_ylabel('Rating')
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Online vs Offline Orders'])
 
 # Function to plot average cost for two
+@profiler.timed()
 def plot_average_cost():
     clear_content()
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.histplot(df['approx_cost(for two people)'], bins=30, kde=True, ax=ax)
-    ax.set_title('Distribution of Approximate Cost for Two People')
-    ax.set_xlabel('Cost')
-    
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Average Cost for Two'])
 
 # Function to plot top rated restaurants
+@profiler.timed()
 def plot_top_rated():
     clear_content()
-    fig, ax = plt.subplots(figsize=(12, 6))
-    top_rated = df.sort_values(by='rate', ascending=False).head(10)
-    sns.barplot(x='name', y='rate', data=top_rated, ax=ax)
-    ax.set_title('Top 10 Rated Restaurants')
-    ax.set_xlabel('Restaurant Name')
-    ax.set_ylabel('Rating')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Top Rated Restaurants'])
 
 # New plot functions
 
+@profiler.timed()
 def plot_cuisine_wordcloud():
     clear_content()
-    if 'cuisines' not in df.columns:
+    if not get_summary().cuisine_frequencies():
         tk.Label(main_content, text="Cuisine data not available in the dataset").pack()
         return
-    print(df['cuisines'].value_counts())  # Keep this for debugging
-    text = ' '.join(df['cuisines'].dropna())
-    if not text:
-        tk.Label(main_content, text="No cuisine data available").pack()
-        return
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis('off')
-    ax.set_title('Cuisine Word Cloud', fontsize=16)
-    
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, views.draw_cuisine_wordcloud, figsize=(10, 6))
 
+@profiler.timed()
 def plot_location_analysis():
     clear_content()
     if 'location' not in df.columns:
         tk.Label(main_content, text="Location data not available in the dataset").pack()
         return
-    print(df['location'].value_counts())  # Keep this for debugging
     top_locations = df['location'].value_counts().head(10)
     if top_locations.empty:
         tk.Label(main_content, text="No location data available").pack()
         return
     # ... rest of the function
 
+@profiler.timed()
 def plot_price_range_distribution():
     clear_content()
-    df['price_range'] = pd.cut(df['approx_cost(for two people)'], bins=[0, 500, 1000, 1500, 2000, np.inf], labels=['0-500', '501-1000', '1001-1500', '1501-2000', '2000+'])
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.countplot(x='price_range', data=df, ax=ax)
-    ax.set_title('Price Range Distribution', fontsize=16)
-    ax.set_xlabel('Price Range (for two people)')
-    ax.set_ylabel('Number of Restaurants')
-    
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Price Range Distribution'])
 
+@profiler.timed()
 def plot_correlation_heatmap():
     clear_content()
-    numeric_df = df[['rate', 'votes', 'approx_cost(for two people)']]
-    corr = numeric_df.corr()
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(corr, annot=True, cmap='coolwarm', ax=ax)
-    ax.set_title('Correlation Heatmap', fontsize=16)
-    
-    canvas = FigureCanvasTkAgg(fig, master=main_content)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True, padx=20, pady=20)
+    show_view(main_content, *views.SIDEBAR_VIEWS['Correlation Heatmap'])
 
+@profiler.timed()
 def create_data_query_page():
     clear_content()
+    if df is None:
+        tk.Label(main_content, text="Data queries need the full dataset and are not available in streaming mode", bg='white').pack(pady=20)
+        return
     
     query_frame = tk.Frame(main_content, bg='white')
     query_frame.pack(pady=20, padx=20, fill='x')
@@ -245,167 +368,69 @@ def create_data_query_page():
     result_frame = tk.Frame(main_content, bg='white')
     result_frame.pack(pady=20, padx=20, fill='both', expand=True)
 
+@profiler.timed()
 def process_query(query):
     clear_frame(result_frame)
     
-    # Normalize the query
-    query = query.lower()
-    
-    # Define keyword mappings
-    keyword_mappings = {
-        'top rated': ['top', 'best', 'highest rated'],
-        'online vs offline': ['online', 'offline', 'delivery'],
-        'cost': ['price', 'expensive', 'cheap'],
-        'type': ['category', 'cuisine'],
-        'rating': ['rate', 'score'],
-        'votes': ['popular', 'likes'],
-        'location': ['area', 'place'],
-        'book table': ['reservation', 'booking'],
-    }
-    
-    # Function to check for keyword matches
-    def keyword_match(keywords):
-        return any(fuzz.partial_ratio(keyword, query) > 80 for keyword in keywords)
-    
-    # Determine the type of analysis based on the query
-    if keyword_match(keyword_mappings['top rated']):
-        plot_top_rated_restaurants()
-    elif keyword_match(keyword_mappings['online vs offline']):
-        plot_online_vs_offline_orders()
-    elif keyword_match(keyword_mappings['cost']):
-        plot_cost_analysis()
-    elif keyword_match(keyword_mappings['type']):
-        plot_restaurant_types()
-    elif keyword_match(keyword_mappings['rating']):
-        plot_rating_analysis()
-    elif keyword_match(keyword_mappings['votes']):
-        plot_votes_analysis()
-    elif keyword_match(keyword_mappings['location']):
-        plot_location_analysis()
-    elif keyword_match(keyword_mappings['book table']):
-        plot_book_table_analysis()
+    # Determine the type of analysis based on the query (keyword index is built once, results cached).
+    # The fuzzy matcher is only imported once the Data Query page is actually used.
+    from query_router import route
+    intent = route(query)
+    if intent is not None:
+        query_handlers[intent]()
     else:
         tk.Label(result_frame, text="I'm sorry, I couldn't understand your query. Please try again with a different question.", bg='white', wraplength=500).pack(pady=20)
 
-def clear_frame(frame):
-    for widget in frame.winfo_children():
-        widget.destroy()
-
 # Modify these plotting functions to work with the result_frame
+@profiler.timed()
 def plot_top_rated_restaurants():
-    fig, ax = plt.subplots(figsize=(10, 6))
-    top_rated = df.sort_values(by='rate', ascending=False).head(10)
-    sns.barplot(x='name', y='rate', data=top_rated, ax=ax)
-    ax.set_title('Top 10 Rated Restaurants')
-    ax.set_xlabel('Restaurant Name')
-    ax.set_ylabel('Rating')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=result_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
     explanation = "This chart shows the top 10 highest-rated restaurants in the Zomato dataset."
-    tk.Label(result_frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+    show_view(result_frame, *views.QUERY_VIEWS['top rated'], padding=0, explanation=explanation)
 
 # New plotting functions
 
+@profiler.timed()
+def plot_online_vs_offline_orders():
+    explanation = "This chart compares ratings for restaurants that do and don't take online orders."
+    show_view(result_frame, *views.QUERY_VIEWS['online vs offline'], padding=0, explanation=explanation)
+
+@profiler.timed()
 def plot_cost_analysis():
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Histogram of costs
-    sns.histplot(df['approx_cost(for two people)'], bins=30, kde=True, ax=ax1)
-    ax1.set_title('Distribution of Costs for Two People')
-    ax1.set_xlabel('Cost')
-    ax1.set_ylabel('Frequency')
-    
-    # Scatter plot of cost vs rating
-    sns.scatterplot(x='approx_cost(for two people)', y='rate', data=df, ax=ax2)
-    ax2.set_title('Cost vs Rating')
-    ax2.set_xlabel('Cost for Two People')
-    ax2.set_ylabel('Rating')
-    
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=result_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
     explanation = "The left chart shows the distribution of costs for two people. The right chart shows the relationship between cost and rating."
-    tk.Label(result_frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+    show_view(result_frame, *views.QUERY_VIEWS['cost'], padding=0, explanation=explanation)
 
+@profiler.timed()
 def plot_rating_analysis():
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Rating distribution
-    sns.histplot(df['rate'], bins=20, kde=True, ax=ax1)
-    ax1.set_title('Distribution of Ratings')
-    ax1.set_xlabel('Rating')
-    ax1.set_ylabel('Frequency')
-    
-    # Top 10 highest rated restaurants
-    top_rated = df.sort_values('rate', ascending=False).head(10)
-    sns.barplot(x='rate', y='name', data=top_rated, ax=ax2)
-    ax2.set_title('Top 10 Highest Rated Restaurants')
-    ax2.set_xlabel('Rating')
-    ax2.set_ylabel('Restaurant Name')
-    
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=result_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
     explanation = "The left chart shows the distribution of ratings. The right chart shows the top 10 highest rated restaurants."
-    tk.Label(result_frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+    show_view(result_frame, *views.QUERY_VIEWS['rating'], padding=0, explanation=explanation)
 
+@profiler.timed()
 def plot_votes_analysis():
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Votes distribution
-    sns.histplot(df['votes'], bins=30, kde=True, ax=ax1)
-    ax1.set_title('Distribution of Votes')
-    ax1.set_xlabel('Number of Votes')
-    ax1.set_ylabel('Frequency')
-    ax1.set_xscale('log')
-    
-    # Top 10 most voted restaurants
-    top_voted = df.sort_values('votes', ascending=False).head(10)
-    sns.barplot(x='votes', y='name', data=top_voted, ax=ax2)
-    ax2.set_title('Top 10 Most Voted Restaurants')
-    ax2.set_xlabel('Number of Votes')
-    ax2.set_ylabel('Restaurant Name')
-    
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=result_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
     explanation = "The left chart shows the distribution of votes (log scale). The right chart shows the top 10 restaurants with the most votes."
-    tk.Label(result_frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+    show_view(result_frame, *views.QUERY_VIEWS['votes'], padding=0, explanation=explanation)
 
+@profiler.timed()
 def plot_book_table_analysis():
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    # Pie chart of book table options
-    book_table_counts = df['book_table'].value_counts()
-    ax1.pie(book_table_counts, labels=book_table_counts.index, autopct='%1.1f%%')
-    ax1.set_title('Proportion of Restaurants Offering Table Booking')
-    
-    # Comparison of ratings for restaurants with and without table booking
-    sns.boxplot(x='book_table', y='rate', data=df, ax=ax2)
-    ax2.set_title('Ratings for Restaurants With and Without Table Booking')
-    ax2.set_xlabel('Table Booking Available')
-    ax2.set_ylabel('Rating')
-    
-    plt.tight_layout()
-    canvas = FigureCanvasTkAgg(fig, master=result_frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
-    
     explanation = "The left chart shows the proportion of restaurants offering table booking. The right chart compares ratings for restaurants with and without table booking."
-    tk.Label(result_frame, text=explanation, bg='white', wraplength=500).pack(pady=10)
+    show_view(result_frame, *views.QUERY_VIEWS['book table'], padding=0, explanation=explanation)
+
+# Analysis to show for each query intent
+query_handlers = {
+    'top rated': plot_top_rated_restaurants,
+    'online vs offline': plot_online_vs_offline_orders,
+    'cost': plot_cost_analysis,
+    'type': plot_restaurant_types,
+    'rating': plot_rating_analysis,
+    'votes': plot_votes_analysis,
+    'location': plot_location_analysis,
+    'book table': plot_book_table_analysis,
+}
 
 # Define update_content function
+@profiler.timed()
 def update_content(*args):
+    if not data_ready:
+        return  # The loading screen stays up; the selected view is shown once data is in
     selected_option = option_var.get()
     if selected_option == 'Restaurant Types':
         plot_restaurant_types()
@@ -426,6 +451,80 @@ def update_content(*args):
     elif selected_option == 'Data Query':
         create_data_query_page()
 
+# Function to fill the filter bar with one drop-down per filter dimension,
+# keeping the current choices that still exist in the data
+def build_filter_bar():
+    from filter_index import FILTERS
+
+    for widget in filter_bar.winfo_children():
+        widget.destroy()
+    index = filter_index
+    if index is None:
+        active_filters.clear()
+        return  # No rows to filter in streaming mode
+    for dimension, label in FILTERS.items():
+        values = ['All'] + [str(value) for value in index.values(dimension)]
+        previous = filter_vars[dimension].get() if dimension in filter_vars else 'All'
+        filter_vars[dimension] = tk.StringVar(value=previous if previous in values else 'All')
+        tk.Label(filter_bar, text=label, bg='#ecf0f1', font=("Arial", 10)).pack(side='left', padx=(10, 2), pady=5)
+        combo = ttk.Combobox(filter_bar, textvariable=filter_vars[dimension], values=values, state='readonly', width=12)
+        combo.bind('<<ComboboxSelected>>', lambda event: apply_filters())
+        combo.pack(side='left', pady=5)
+    ttk.Button(filter_bar, text="Clear", command=clear_filters).pack(side='left', padx=10, pady=5)
+    apply_filters(redraw=False)
+
+# Function to read the filter bar and redraw the current view with the new selection
+def apply_filters(redraw=True):
+    active_filters.clear()
+    active_filters.update({dimension: [var.get()] for dimension, var in filter_vars.items() if var.get() != 'All'})
+    if redraw:
+        update_content()
+
+def clear_filters():
+    for var in filter_vars.values():
+        var.set('All')
+    apply_filters()
+
+# Function to load (or reload) the data on a worker thread, with a progress bar meanwhile
+def start_loading():
+    clear_content()
+    loading_frame = tk.Frame(main_content, bg='white')
+    loading_frame.pack(expand=True)
+    loading_label = tk.Label(loading_frame, text="Loading data...", bg='white', font=("Arial", 12))
+    loading_label.pack(pady=10)
+    progress = ttk.Progressbar(loading_frame, mode='indeterminate', length=300)
+    progress.pack()
+    progress.start(10)
+
+    def done(changed):
+        global data_ready
+        data_ready = True
+        refresh_button.config(state='normal')
+        show_load_error(None)
+        if changed:
+            bitmap_cache.clear()
+            build_filter_bar()
+        if startup_probe:
+            print('data-ready', flush=True)
+            root.after(0, on_close)
+        update_content()
+
+    def failed(error):
+        refresh_button.config(state='normal')
+        message = f"Could not load the data: {error}"
+        show_load_error(message)
+        if loading_frame.winfo_exists():  # Gone if a view was opened during a refresh
+            progress.stop()
+            loading_label.config(text=message)
+
+    refresh_button.config(state='disabled')  # Until this load is done
+    render_engine.submit('data', lambda superseded: load_dataset(), done, failed)
+
+# Function for the "Refresh Data" button: pick up appended rows (or reload a
+# rewritten CSV), then redraw
+def refresh_data():
+    start_loading()
+
 # Apply a modern theme to the Tkinter widgets
 style = ttk.Style()
 style.theme_use('clam')
@@ -438,8 +537,84 @@ footer.pack(side='bottom', fill='x')
 footer_label = tk.Label(footer, text="© 2024 Zomato Data Analysis Dashboard", bg='#2c3e50', fg='white')
 footer_label.pack(pady=5)
 
-# Initial content update
-update_content()
+# The last load error, kept in the footer so it stays up whichever view is open
+load_error_label = tk.Label(footer, text="", bg='#2c3e50', fg='#e74c3c')
+
+def show_load_error(message):
+    if message:
+        load_error_label.config(text=message)
+        load_error_label.pack(pady=(0, 5))
+    else:
+        load_error_label.pack_forget()
+
+# Performance overlay: stage timings of the last view drawn, shown in the footer.
+# Toggle it with F12, or start with it on with ZOMATO_PERF_OVERLAY=1.
+perf_label = tk.Label(footer, text="", bg='#2c3e50', fg='#95a5a6', font=("Courier", 9))
+perf_overlay = tk.BooleanVar(value=os.environ.get('ZOMATO_PERF_OVERLAY') == '1')
+last_view = None
+
+def update_overlay(view=None):
+    global last_view
+    last_view = view or last_view
+    if perf_overlay.get() and last_view is not None:
+        perf_label.config(text=profiler.overlay_text(last_view))
+        perf_label.pack(pady=(0, 5))
+    else:
+        perf_label.pack_forget()
+
+def toggle_overlay(event=None):
+    perf_overlay.set(not perf_overlay.get())
+    update_overlay()
+
+root.bind('<F12>', toggle_overlay)
+
+# Function to stop the render workers when the window closes
+# Set ZOMATO_TRACE_FILE to save the recorded spans on exit: a Chrome trace by
+# default (chrome://tracing, ui.perfetto.dev), or the raw events with ZOMATO_TRACE_FORMAT=json
+def on_close():
+    render_engine.shutdown()
+    figure_pool.release()
+    trace_file = os.environ.get('ZOMATO_TRACE_FILE')
+    if trace_file:
+        if os.environ.get('ZOMATO_TRACE_FORMAT') == 'json':
+            profiler.export_json(trace_file)
+        else:
+            profiler.export_chrome_trace(trace_file)
+    root.destroy()
+
+root.protocol('WM_DELETE_WINDOW', on_close)
+
+# Re-render the current chart when the window is resized (debounced)
+resize_job = None
+last_size = None
+
+def on_resize(event):
+    global resize_job, last_size
+    if event.widget is not main_content or (event.width, event.height) == last_size:
+        return
+    last_size = (event.width, event.height)
+    if resize_job is not None:
+        root.after_cancel(resize_job)
+    if option_var.get() != 'Data Query':
+        resize_job = root.after(250, update_content)
+
+main_content.bind('<Configure>', on_resize)
+
+# Startup benchmark hook (benchmarks/bench_startup.py): report first paint and
+# data ready on stdout, then exit
+startup_probe = os.environ.get('ZOMATO_STARTUP_PROBE') == '1'
+
+def report_first_paint(event):
+    if event.widget is root:
+        root.unbind('<Map>')
+        print('first-paint', flush=True)
+
+if startup_probe:
+    root.bind('<Map>', report_first_paint)
+
+# Show the window straight away and load the data behind a progress bar
+start_loading()
 
-# Start the Tkinter main loop
-root.mainloop()
+# Start the Tkinter main loop (benchmarks/soak_views.py imports this module and runs the loop itself)
+if __name__ == '__main__':
+    root.mainloop()
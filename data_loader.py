@@ -0,0 +1,296 @@
+import copy
+import hashlib
+import io
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional, we just re-parse the CSV every launch
+    pa = None
+    feather = None
+
+DATA_FILE = 'Zomato data .csv'
+COST_COLUMN = 'approx_cost(for two people)'
+
+# Files bigger than this are streamed in chunks instead of loaded whole
+STREAMING_THRESHOLD = 512 * 1024 * 1024
+
+# Bump this whenever the parsed schema changes so old caches get rebuilt
+CACHE_VERSION = 2
+
+# Bytes hashed at the start of the file and just before the end we last read,
+# to tell rows appended to the CSV from a rewrite of it
+PROBE_BYTES = 64 * 1024
+
+# How a CSV changed between two snapshots
+UNCHANGED = 'unchanged'
+APPENDED = 'appended'
+REWRITTEN = 'rewritten'
+
+# Explicit schema for the CSV so pandas doesn't have to infer types
+CSV_DTYPES = {
+    'name': 'object',
+    'online_order': 'category',
+    'book_table': 'category',
+    'rate': 'object',
+    'votes': 'Int32',
+    COST_COLUMN: 'Int32',
+    'listed_in(type)': 'category',
+}
+# Counts can be blank, hence the nullable Int32. pandas' parser ignores
+# `thousands` for nullable integers, so they are parsed as float64 and
+# narrowed to the schema type by _finish_types().
+PARSE_DTYPES = {column: 'float64' if dtype == 'Int32' else dtype for column, dtype in CSV_DTYPES.items()}
+
+
+# Function to give freshly parsed rows their final column types
+def _finish_types(data):
+    data['rate'] = parse_rate(data['rate'])
+    for column, dtype in CSV_DTYPES.items():
+        if PARSE_DTYPES[column] != dtype:
+            data[column] = data[column].astype(dtype)
+    return data
+
+
+# Function to turn "4.1/5" strings into float32 ratings without a per-row lambda
+def parse_rate(rate):
+    if not (pd.api.types.is_object_dtype(rate) or pd.api.types.is_string_dtype(rate)):
+        return rate.astype('float32')
+    head = rate.str.split('/', n=1).str[0].str.strip()
+    return pd.to_numeric(head, errors='coerce').astype('float32')
+
+
+# File object over bytes [start, end) of a file, so pandas parses exactly the
+# rows a snapshot covers even while the feed keeps appending
+class _ByteRange(io.RawIOBase):
+    def __init__(self, path, start=0, end=None):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._left = None if end is None else end - start
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        view = memoryview(buffer)
+        if self._left is not None:
+            view = view[:self._left]
+        count = self._file.readinto(view)
+        if self._left is not None:
+            self._left -= count
+        return count
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+# Function to open a byte range of the CSV for pandas. Past the header the
+# column names have to be passed in, since the range has no header line.
+def _open_range(path, start, end, columns):
+    header = {} if start == 0 else {'header': None, 'names': columns}
+    return io.BufferedReader(_ByteRange(path, start, end)), header
+
+
+# Function to read the raw CSV (or the rows between two byte offsets) with the typed schema
+def read_csv_typed(path=DATA_FILE, start=0, end=None, columns=None, **kwargs):
+    handle, header = _open_range(path, start, end, columns)
+    with handle:
+        data = pd.read_csv(handle, dtype=PARSE_DTYPES, thousands=',', **header, **kwargs)
+    return _finish_types(data)
+
+
+# Function to give a frame read back from the Arrow cache the column types a
+# CSV parse gives it (Arrow can hand text back as strings)
+def apply_schema(data):
+    dtypes = {column: dtype for column, dtype in CSV_DTYPES.items()
+              if column != 'rate' and column in data and data[column].dtype != dtype}
+    return data.astype(dtypes) if dtypes else data
+
+
+# Function to decide whether a CSV is too big to load whole (ZOMATO_STREAMING=1 forces it)
+def should_stream(path=DATA_FILE):
+    return os.environ.get('ZOMATO_STREAMING') == '1' or os.path.getsize(path) > STREAMING_THRESHOLD
+
+
+# Function to stream the CSV (or the rows between two byte offsets) in bounded chunks
+def iter_chunks(path=DATA_FILE, chunksize=200_000, start=0, end=None, columns=None):
+    if end is not None and end <= start:
+        return
+    handle, header = _open_range(path, start, end, columns)
+    with handle, pd.read_csv(handle, dtype=PARSE_DTYPES, thousands=',', chunksize=chunksize, **header) as reader:
+        for chunk in reader:
+            yield _finish_types(chunk)
+
+
+# Function to add newly read rows to a loaded frame, keeping categorical columns categorical
+def append_rows(data, chunks):
+    frames = [data, *chunks]
+    if len(frames) == 1:
+        return data
+    for column, dtype in CSV_DTYPES.items():
+        if dtype == 'category' and all(isinstance(frame[column].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = pd.api.types.union_categoricals([frame[column] for frame in frames]).categories
+            frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _fingerprint(path, stat):
+    key = f'{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{CACHE_VERSION}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+# Function to fingerprint the source CSV (size + mtime is enough to spot a new export)
+def data_fingerprint(path=DATA_FILE):
+    return _fingerprint(path, os.stat(path))
+
+
+def _digest(path, start, end):
+    with open(path, 'rb') as handle:
+        handle.seek(start)
+        return hashlib.sha1(handle.read(end - start)).hexdigest()
+
+
+# Function to find the end of the last complete line in the first `size` bytes
+# of a file. A feed halfway through writing a row leaves a partial line after it.
+def _complete_size(path, size):
+    with open(path, 'rb') as handle:
+        end = size
+        while end > 0:
+            start = max(0, end - PROBE_BYTES)
+            handle.seek(start)
+            newline = handle.read(end - start).rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+    return 0
+
+
+# Function to check whether a line break is written at an offset of a file
+def _line_break_at(path, offset):
+    with open(path, 'rb') as handle:
+        handle.seek(offset)
+        return handle.read(1) in (b'\n', b'\r')
+
+
+# The state of the CSV at one moment: its size, fingerprint and column names,
+# how far rows are read from it, plus hashes of its first bytes and of the
+# bytes just before that point. A later snapshot with the same hashes at the
+# same offsets only has rows appended.
+# A full load reads to the end of the file, including a last line with no
+# newline after it. Appended rows are only read up to the last complete line
+# (see complete_lines()), leaving a row the feed is still writing for later.
+class SourceSnapshot:
+    def __init__(self, path=DATA_FILE):
+        stat = os.stat(path)
+        self.path = path
+        self.size = stat.st_size
+        self.end = self.size
+        self.lines_end = _complete_size(path, self.size)
+        self.fingerprint = _fingerprint(path, stat)
+        self.head = _digest(path, 0, min(self.lines_end, PROBE_BYTES))
+        self.edge = _digest(path, max(0, self.end - PROBE_BYTES), self.end)
+        self._lines_edge = self.edge if self.lines_end == self.end else \
+            _digest(path, max(0, self.lines_end - PROBE_BYTES), self.lines_end)
+        self.columns = list(pd.read_csv(path, nrows=0).columns) if self.size else []
+
+    # Function to get this snapshot as far as iter_appended() reads it: up to
+    # the last complete line
+    def complete_lines(self):
+        snapshot = copy.copy(self)
+        snapshot.end, snapshot.edge = self.lines_end, self._lines_edge
+        return snapshot
+
+    # Function to classify how the CSV changed from this snapshot to a newer one
+    def change_to(self, newer):
+        if newer.fingerprint == self.fingerprint:
+            return UNCHANGED
+        if newer.size < self.end or newer.columns != self.columns:
+            return REWRITTEN
+        if _digest(newer.path, 0, min(self.lines_end, PROBE_BYTES)) != self.head:
+            return REWRITTEN
+        if _digest(newer.path, max(0, self.end - PROBE_BYTES), self.end) != self.edge:
+            return REWRITTEN
+        if newer.lines_end <= self.end:
+            return UNCHANGED  # Only part of a line was written since, nothing new to read yet
+        if self.end > self.lines_end and not _line_break_at(newer.path, self.end):
+            # The last line was read before its newline and has been added to
+            # since, so the row parsed from it was cut short: read it all again
+            return REWRITTEN
+        return APPENDED
+
+    # Function to stream the rows added between this snapshot and a newer one,
+    # up to the newer one's last complete line
+    def iter_appended(self, newer, chunksize=200_000):
+        return iter_chunks(self.path, chunksize=chunksize, start=self.end, end=newer.lines_end, columns=self.columns)
+
+
+# Function to work out where the Arrow cache for a CSV lives
+def cache_path(path=DATA_FILE, fingerprint=None):
+    if fingerprint is None:
+        fingerprint = data_fingerprint(path)
+    folder, filename = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(filename)[0].strip().replace(' ', '_')
+    return os.path.join(folder, f'.{stem}.{fingerprint}.arrow')
+
+
+# Function to drop caches left behind by older versions of the CSV
+def _remove_stale_caches(path, keep):
+    folder, filename = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(filename)[0].strip().replace(' ', '_')
+    for entry in os.listdir(folder):
+        if entry.startswith(f'.{stem}.') and entry.endswith('.arrow'):
+            full_path = os.path.join(folder, entry)
+            if full_path != keep:
+                try:
+                    os.remove(full_path)
+                except OSError:
+                    pass
+
+
+# Function to write the parsed frame as an uncompressed Arrow file so it can be memory-mapped
+def _write_cache(data, target):
+    tmp_path = f'{target}.tmp{os.getpid()}'
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, target)
+
+
+# Function to say whether loads should go through the shared columnar store
+# (shared_store.py) instead of a private copy per process (ZOMATO_SHARED_STORE=1)
+def use_shared_store():
+    return os.environ.get('ZOMATO_SHARED_STORE') == '1'
+
+
+# Function to load the dataset, using the Arrow cache when the CSV hasn't changed.
+# Pass a snapshot to read exactly the rows it covers (rows appended while
+# loading are left for the next refresh).
+def load_data(path=DATA_FILE, use_cache=True, snapshot=None):
+    if snapshot is None:
+        snapshot = SourceSnapshot(path)
+    if use_cache and use_shared_store():
+        from shared_store import load_shared
+        # No apply_schema() here: 'name' stays categorical over the mapped codes,
+        # casting it to object would give every process a private copy of it
+        return load_shared(path, snapshot)
+    if not use_cache or feather is None:
+        return read_csv_typed(path, end=snapshot.size)
+
+    target = cache_path(path, snapshot.fingerprint)
+    if os.path.exists(target):
+        try:
+            table = feather.read_table(target, memory_map=True)
+            return apply_schema(table.to_pandas())
+        except (OSError, pa.ArrowInvalid):
+            pass  # Corrupt or half-written cache, rebuild it below
+
+    data = read_csv_typed(path, end=snapshot.size)
+    try:
+        _write_cache(data, target)
+        _remove_stale_caches(path, keep=target)
+    except OSError:
+        pass  # Read-only data folder, keep going without a cache
+    return data
@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+
+from aggregates import PRICE_RANGE_BINS, PRICE_RANGE_LABELS
+from data_loader import COST_COLUMN
+
+# Ratings are grouped into these bands for filtering (left-closed)
+RATING_BAND_BINS = [0, 3.0, 3.5, 4.0, 4.5, np.inf]
+RATING_BAND_LABELS = ['Below 3.0', '3.0-3.4', '3.5-3.9', '4.0-4.4', '4.5+']
+
+# Number of set bits in each possible byte, to count rows in a packed bitmap
+POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+
+# Filter dimensions, with the label shown next to each one
+FILTERS = {
+    'listed_in(type)': 'Type',
+    'online_order': 'Online order',
+    'book_table': 'Book table',
+    'price_range': 'Price range',
+    'rating_band': 'Rating',
+}
+
+
+# Function to turn a {dimension: values} selection into a hashable cache key.
+# Dimensions without a selection don't filter anything and are left out.
+def filter_key(filters):
+    return tuple(sorted((dimension, tuple(sorted(map(str, values))))
+                        for dimension, values in filters.items() if values))
+
+
+# Function to add bits for new rows to the end of a packed bitmap of `rows` bits.
+# Only the last, partly used byte is unpacked, so the cost is in the new rows.
+def _append_bits(packed, rows, bits):
+    used = rows % 8
+    if used == 0:
+        return np.concatenate([packed, np.packbits(bits)])
+    head = np.unpackbits(packed[-1:], count=used).astype(bool)
+    return np.concatenate([packed[:-1], np.packbits(np.concatenate([head, bits]))])
+
+
+# Per-value bitmaps (one bit per row, packed 8 rows to a byte) for the
+# categorical columns and for cost and rating buckets, built once per load and
+# extended when rows are appended to the CSV.
+# A selection is answered by OR-ing the bitmaps of the chosen values within a
+# dimension and AND-ing across dimensions, without touching the frame itself.
+class FilterIndex:
+    def __init__(self, data):
+        self.rows = 0
+        self.bitmaps = {dimension: {} for dimension in FILTERS}
+        self.append(data)
+
+    # Function to get the filter value of each row, per dimension
+    @staticmethod
+    def _dimensions(data):
+        for column in ('listed_in(type)', 'online_order', 'book_table'):
+            yield column, data[column]
+        yield 'price_range', pd.cut(data[COST_COLUMN], bins=PRICE_RANGE_BINS, labels=PRICE_RANGE_LABELS)
+        yield 'rating_band', pd.cut(data['rate'], bins=RATING_BAND_BINS, labels=RATING_BAND_LABELS, right=False)
+
+    # Function to extend the bitmaps with rows added after the ones already indexed.
+    # Values first seen in the new rows get a bitmap with no earlier rows set.
+    def append(self, data):
+        for dimension, values in self._dimensions(data):
+            categorical = pd.Categorical(values)
+            codes = np.asarray(categorical.codes)
+            bitmaps = self.bitmaps[dimension]
+            for value in [*bitmaps, *(value for value in categorical.categories if value not in bitmaps)]:
+                packed = bitmaps.get(value, np.zeros((self.rows + 7) // 8, dtype=np.uint8))
+                matched = codes == categorical.categories.get_loc(value) if value in categorical.categories \
+                    else np.zeros(len(codes), dtype=bool)
+                bitmaps[value] = _append_bits(packed, self.rows, matched)
+        self.rows += len(data)
+
+    # Function to get an independent copy, e.g. to append rows to while views
+    # are still filtering with the original (bitmaps are replaced, never modified)
+    def copy(self):
+        copied = object.__new__(type(self))
+        copied.rows = self.rows
+        copied.bitmaps = {dimension: dict(bitmaps) for dimension, bitmaps in self.bitmaps.items()}
+        return copied
+
+    # Function to list the values a dimension can be filtered on
+    def values(self, dimension):
+        return list(self.bitmaps[dimension])
+
+    # Function to get the packed bitmap of the rows matching a selection (None means every row)
+    def select(self, filters):
+        result = None
+        for dimension, values in filters.items():
+            if not values:
+                continue
+            bitmaps = self.bitmaps[dimension]
+            matched = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+            for value in values:
+                if value in bitmaps:
+                    np.bitwise_or(matched, bitmaps[value], out=matched)
+            result = matched if result is None else np.bitwise_and(result, matched, out=result)
+        return result
+
+    # Function to get the row positions matching a selection (None means every row)
+    def positions(self, filters):
+        bitmap = self.select(filters)
+        if bitmap is None:
+            return None
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.rows))
+
+    def count(self, filters):
+        bitmap = self.select(filters)
+        if bitmap is None:
+            return self.rows
+        return int(POPCOUNT[bitmap].sum(dtype=np.int64))
@@ -0,0 +1,107 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+# Stages a view goes through, in order, for the footer overlay
+VIEW_STAGES = ('load', 'aggregate', 'draw', 'raster', 'blit')
+
+
+# Always-on span recorder. Spans are only opened per user action and per render
+# stage, never per row, and each costs a few microseconds. The ring buffer keeps
+# memory bounded. Allocation counts are opt-in: ZOMATO_TRACE_BLOCKS=1 records
+# the sys.getallocatedblocks() delta of each span, which walks every arena and
+# so costs hundreds of microseconds once millions of objects are alive (e.g.
+# the 'name' strings of a large dataset); ZOMATO_TRACE_ALLOC=1 adds byte
+# deltas from tracemalloc, which slows every allocation down. ZOMATO_PROFILE=0
+# turns recording off.
+class Profiler:
+    def __init__(self, enabled=True, capacity=20_000, trace_blocks=False, trace_bytes=False):
+        self.enabled = enabled
+        self.events = deque(maxlen=capacity)
+        self.trace_blocks = trace_blocks
+        self.trace_bytes = trace_bytes
+        self._origin = time.perf_counter_ns()
+        if trace_bytes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, category='stage', **args):
+        if not self.enabled:
+            yield
+            return
+        blocks = sys.getallocatedblocks() if self.trace_blocks else None
+        traced = tracemalloc.get_traced_memory()[0] if self.trace_bytes else None
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            if blocks is not None:
+                args['alloc_blocks'] = sys.getallocatedblocks() - blocks
+            if traced is not None:
+                args['alloc_bytes'] = tracemalloc.get_traced_memory()[0] - traced
+            self.events.append({
+                'name': name,
+                'cat': category,
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'tid': threading.get_ident(),
+                'args': args,
+            })
+
+    # Decorator form of span() for whole functions
+    def timed(self, name=None, category='call'):
+        def decorate(function):
+            span_name = name or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, category):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # Function to get the latest event of each stage recorded for a view.
+    # Stages not tied to a view (like 'load') are included as well.
+    def view_stages(self, view):
+        stages = {}
+        for event in reversed(self.events):
+            if event['cat'] == 'stage' and event['args'].get('view') in (view, None):
+                stages.setdefault(event['name'], event)
+                if all(stage in stages for stage in VIEW_STAGES):
+                    break
+        return {stage: stages[stage] for stage in VIEW_STAGES if stage in stages}
+
+    # Function to format the latest stage timings of a view as one line of text
+    def overlay_text(self, view):
+        stages = self.view_stages(view)
+        parts = [f"{name} {event['dur'] / 1000:.1f} ms" for name, event in stages.items()]
+        text = f"{view}: " + ' | '.join(parts)
+        if self.trace_blocks:
+            blocks = sum(event['args'].get('alloc_blocks', 0) for event in stages.values() if 'view' in event['args'])
+            text += f" | {blocks:+d} blocks"
+        return text
+
+    def export_json(self, path):
+        with open(path, 'w') as handle:
+            json.dump(list(self.events), handle, indent=1)
+
+    # Function to write the events in Chrome trace format (chrome://tracing, Perfetto)
+    def export_chrome_trace(self, path):
+        events = [dict(event, ph='X', pid=os.getpid()) for event in self.events]
+        with open(path, 'w') as handle:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, handle)
+
+    def clear(self):
+        self.events.clear()
+
+
+profiler = Profiler(enabled=os.environ.get('ZOMATO_PROFILE', '1') != '0',
+                    trace_blocks=os.environ.get('ZOMATO_TRACE_BLOCKS') == '1',
+                    trace_bytes=os.environ.get('ZOMATO_TRACE_ALLOC') == '1')
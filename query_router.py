@@ -0,0 +1,85 @@
+import functools
+import re
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # rapidfuzz is optional, fall back to one-by-one fuzzywuzzy matching
+    from fuzzywuzzy import fuzz
+    process = None
+
+# Keywords for each analysis, in priority order: the first intent with a
+# matching keyword wins, just like the old if/elif chain in process_query
+INTENT_KEYWORDS = {
+    'top rated': ['top', 'best', 'highest rated'],
+    'online vs offline': ['online', 'offline', 'delivery'],
+    'cost': ['price', 'expensive', 'cheap'],
+    'type': ['category', 'cuisine'],
+    'rating': ['rate', 'score'],
+    'votes': ['popular', 'likes'],
+    'location': ['area', 'place'],
+    'book table': ['reservation', 'booking'],
+}
+
+# A keyword matches when its partial_ratio score is above this. rapidfuzz and
+# fuzzywuzzy don't score quite alike: rapidfuzz also tries alignments that run
+# off either end of the query, so 'best' scores 86 against 'likes highest'
+# (the 'est' at the end) where fuzzywuzzy gives 75. Some queries with several
+# keywords therefore match an earlier intent with rapidfuzz than without it
+# (about 4% of random keyword combinations; single keywords route the same).
+MATCH_THRESHOLD = 80
+CACHE_SIZE = 4096
+
+
+# Function to normalize a query so trivially different spellings share a cache entry
+def normalize_query(query):
+    return re.sub(r'\s+', ' ', query.lower()).strip()
+
+
+# Keyword index built once: all keywords in one flat list, grouped by intent
+class QueryRouter:
+    def __init__(self, intent_keywords=INTENT_KEYWORDS, threshold=MATCH_THRESHOLD, cache_size=CACHE_SIZE):
+        self.intents = list(intent_keywords)
+        self.keywords = [keyword for keywords in intent_keywords.values() for keyword in keywords]
+        self.intent_starts = np.cumsum([0] + [len(keywords) for keywords in intent_keywords.values()])[:-1]
+        self.threshold = threshold
+        self._route_cached = functools.lru_cache(maxsize=cache_size)(self._route_normalized)
+
+    # Function to score every query against every keyword in one pass
+    def _scores(self, queries):
+        if process is not None:
+            return process.cdist(queries, self.keywords, scorer=fuzz.partial_ratio, dtype=np.float32, workers=-1)
+        return np.array([[fuzz.partial_ratio(keyword, query) for keyword in self.keywords] for query in queries],
+                        dtype=np.float32).reshape(len(queries), len(self.keywords))
+
+    # Function to turn a score matrix into the winning intent per row (None when nothing matches)
+    def _pick(self, scores):
+        matched = np.logical_or.reduceat(scores > self.threshold, self.intent_starts, axis=1)
+        first = matched.argmax(axis=1)
+        return [self.intents[index] if row[index] else None for index, row in zip(first, matched)]
+
+    def _route_normalized(self, query):
+        return self._pick(self._scores([query]))[0]
+
+    def route(self, query):
+        return self._route_cached(normalize_query(query))
+
+    # Function to classify many queries at once. Repeats within the batch are
+    # scored once; this doesn't read or fill the route() cache.
+    def route_many(self, queries):
+        normalized = [normalize_query(query) for query in queries]
+        unique = list(dict.fromkeys(normalized))
+        intents = dict(zip(unique, self._pick(self._scores(unique)))) if unique else {}
+        return [intents[query] for query in normalized]
+
+    def cache_info(self):
+        return self._route_cached.cache_info()
+
+
+default_router = QueryRouter()
+
+
+# Function to classify one query with the shared router, no Tk needed
+def route(query):
+    return default_router.route(query)
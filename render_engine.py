@@ -0,0 +1,165 @@
+import itertools
+import queue
+import sys
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from instrumentation import profiler
+
+DPI = 100
+SUBPLOT_PARAMS = ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')
+
+
+# Function to make a bare Agg figure. matplotlib is imported here, on the
+# first render, so the dashboard window can open before it is loaded.
+def new_figure(dpi=DPI, figsize=None):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# Raised inside a job when a newer request has replaced it
+class RenderCancelled(Exception):
+    pass
+
+
+# Keeps one Agg Figure per (pane, worker thread) and clears it for every new
+# view instead of building a new figure each time. Nothing goes through
+# pyplot's figure manager, so figures never pile up behind our back.
+class FigurePool:
+    def __init__(self, dpi=DPI):
+        self.dpi = dpi
+        self._figures = {}
+        self._lock = threading.Lock()
+
+    # Function to get a blank figure of the given pixel size for a pane
+    def acquire(self, pane, size):
+        import matplotlib
+
+        key = (pane, threading.get_ident())
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is None:
+                fig = new_figure(self.dpi)
+                self._figures[key] = fig
+        fig.clear()
+        # tight_layout() from the previous view leaves its margins behind
+        fig.subplots_adjust(**{name: matplotlib.rcParams[f'figure.subplot.{name}'] for name in SUBPLOT_PARAMS})
+        fig.set_size_inches(size[0] / self.dpi, size[1] / self.dpi)
+        return fig
+
+    # Function to drop the figures for one pane (or all of them)
+    def release(self, pane=None):
+        with self._lock:
+            for key in [key for key in self._figures if pane is None or key[0] == pane]:
+                self._figures.pop(key).clear()
+
+    def __len__(self):
+        return len(self._figures)
+
+
+# Function to draw a view into an Agg figure and return a copy of its RGBA pixels.
+# Uses the object-oriented Figure API only, so it is safe off the Tk thread.
+# `view` names the 'draw' and 'raster' stages in the profiler.
+def render_rgba(draw, size, dpi=DPI, superseded=None, pool=None, pane='content', view=None):
+    import numpy as np
+
+    with profiler.span('draw', view=view):
+        if pool is None:
+            fig = new_figure(dpi, figsize=(size[0] / dpi, size[1] / dpi))
+        else:
+            fig = pool.acquire(pane, size)
+        draw(fig)
+    # Rasterizing is the slow part, skip it if the user has already moved on
+    if superseded is not None and superseded():
+        raise RenderCancelled()
+    with profiler.span('raster', view=view):
+        fig.canvas.draw()
+        return np.array(fig.canvas.buffer_rgba())
+
+
+# Runs aggregation + rasterization jobs on a thread pool and hands the results
+# back to the Tk main loop by polling with root.after. Each job belongs to a
+# slot; submitting a new job for a slot cancels the one that was there before.
+class RenderEngine:
+    def __init__(self, root, max_workers=2, poll_interval=25):
+        self.root = root
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='render')
+        self._finished = queue.SimpleQueue()
+        self._latest = {}
+        self._tokens = itertools.count()
+        self._polling = False
+
+    # Function to queue a job: job(superseded) runs on a worker, on_done(result) on the Tk thread
+    def submit(self, slot, job, on_done, on_error=None):
+        token = next(self._tokens)
+        previous = self._latest.get(slot)
+        if previous is not None:
+            previous[1].cancel()  # Only works if it hasn't started, otherwise the result is dropped
+
+        def superseded():
+            return self._latest.get(slot, (None,))[0] != token
+
+        future = self._executor.submit(job, superseded)
+        self._latest[slot] = (token, future)
+        future.add_done_callback(lambda f: self._finished.put((slot, token, f, on_done, on_error)))
+        self._start_polling()
+        return token
+
+    # Function to say whether a job (for one slot, or any) hasn't been handed back yet
+    def pending(self, slot=None):
+        return bool(self._latest) if slot is None else slot in self._latest
+
+    # Function to forget whatever is pending for a slot
+    def cancel(self, slot):
+        previous = self._latest.pop(slot, None)
+        if previous is not None:
+            previous[1].cancel()
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        try:
+            while True:
+                try:
+                    slot, token, future, on_done, on_error = self._finished.get_nowait()
+                except queue.Empty:
+                    break
+                if self._latest.get(slot, (None,))[0] != token:
+                    continue  # Superseded while it was running
+                del self._latest[slot]
+                try:
+                    result = future.result()
+                except (CancelledError, RenderCancelled):
+                    continue
+                except Exception as error:
+                    if on_error is not None:
+                        self._deliver(on_error, error)
+                    continue
+                self._deliver(on_done, result)
+        finally:
+            # Whatever happened above, keep polling while jobs are still out
+            if self._latest:
+                self.root.after(self.poll_interval, self._poll)
+            else:
+                self._polling = False
+
+    # Function to run a callback on the Tk thread. If it raises, the error is
+    # reported the way Tk reports any failing callback and the next results
+    # are still delivered.
+    def _deliver(self, callback, value):
+        try:
+            callback(value)
+        except Exception:
+            self.root.report_callback_exception(*sys.exc_info())
+
+    def shutdown(self):
+        self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,125 @@
+# Headless report engine: renders every dashboard view for one or more CSVs
+# without a Tk window, one city per worker process.
+#
+#   python report.py "Zomato data .csv" other_city.csv --out reports --formats png pdf
+import argparse
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from aggregates import DatasetAggregates, stream_aggregates
+from data_loader import DATA_FILE, load_data, should_stream
+from views import NEEDS_ROWS, QUERY_VIEWS, SIDEBAR_VIEWS
+
+FORMATS = ('png', 'svg', 'pdf')
+DPI = 100
+
+
+# Function to turn a view or file name into something safe for a file name
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+# Function to list every view in the report: sidebar views, then query answers
+def report_views():
+    views = [(name, draw, figsize) for name, (draw, figsize) in SIDEBAR_VIEWS.items()]
+    views += [(f'Query - {name}', draw, figsize) for name, (draw, figsize) in QUERY_VIEWS.items()
+              if (draw, figsize) not in SIDEBAR_VIEWS.values()]
+    return views
+
+
+# Function to name the output folder of each CSV after its file, adding the
+# parent folder where two CSVs share a file name (delhi/zomato.csv and
+# pune/zomato.csv), and a number if even that is the same
+def report_names(csv_paths):
+    names = [slugify(os.path.splitext(os.path.basename(path))[0]) for path in csv_paths]
+    counts = Counter(names)
+    names = [slugify(f'{os.path.basename(os.path.dirname(os.path.abspath(path)))} {name}') if counts[name] > 1
+             else name for path, name in zip(csv_paths, names)]
+    used = set()
+    unique = []
+    for name in names:
+        candidate, number = name, 1
+        while candidate in used:
+            number += 1
+            candidate = f'{name}_{number}'
+        used.add(candidate)
+        unique.append(candidate)
+    return unique
+
+
+# Function to render every view for one CSV (runs in a worker process)
+def render_city(csv_path, out_dir, formats=('png',), dpi=DPI, name=None):
+    city_dir = os.path.join(out_dir, name or report_names([csv_path])[0])
+    os.makedirs(city_dir, exist_ok=True)
+    timings = {'csv': csv_path, 'views': {}}
+
+    start = time.perf_counter()
+    data = None if should_stream(csv_path) else load_data(csv_path)
+    timings['load_ms'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    summary = stream_aggregates(csv_path) if data is None else DatasetAggregates.from_frame(data)
+    timings['aggregate_ms'] = (time.perf_counter() - start) * 1000
+
+    for name, draw, figsize in report_views():
+        if data is None and draw in NEEDS_ROWS:
+            timings['views'][name] = {'skipped': 'needs the full dataset (streaming mode)'}
+            continue
+        view_timing = {}
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        start = time.perf_counter()
+        draw(fig, summary, data)
+        view_timing['draw_ms'] = (time.perf_counter() - start) * 1000
+        for fmt in formats:
+            start = time.perf_counter()
+            fig.savefig(os.path.join(city_dir, f'{slugify(name)}.{fmt}'), format=fmt)
+            view_timing[f'{fmt}_ms'] = (time.perf_counter() - start) * 1000
+        fig.clear()
+        timings['views'][name] = view_timing
+
+    with open(os.path.join(city_dir, 'timings.json'), 'w') as handle:
+        json.dump(timings, handle, indent=2)
+    return timings
+
+
+# Function to print one city's timings as a table
+def print_timings(timings):
+    print(f"\n{timings['csv']}: load {timings['load_ms']:.0f} ms, aggregate {timings['aggregate_ms']:.0f} ms")
+    for name, view_timing in timings['views'].items():
+        if 'skipped' in view_timing:
+            print(f'  {name:40s} skipped: {view_timing["skipped"]}')
+            continue
+        parts = '  '.join(f'{stage[:-3]} {ms:7.1f} ms' for stage, ms in view_timing.items())
+        print(f'  {name:40s} {parts}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render every dashboard view to files, without a window')
+    parser.add_argument('csv', nargs='*', default=[DATA_FILE], help='input CSVs, one report per file')
+    parser.add_argument('--out', default='reports', help='output folder')
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['png'])
+    parser.add_argument('--dpi', type=int, default=DPI)
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(render_city, csv_path, args.out, tuple(args.formats), args.dpi, name): csv_path
+                   for csv_path, name in zip(args.csv, report_names(args.csv))}
+        for future in as_completed(futures):
+            print_timings(future.result())
+    print(f'\n{len(args.csv)} report(s) in {time.perf_counter() - start:.1f}s -> {args.out}')
+
+
+if __name__ == '__main__':
+    main()
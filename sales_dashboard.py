@@ -1,8 +1,14 @@
 import pygame
 import sys
-import matplotlib.pyplot as plt
-import pandas as pd
+import os
+from collections import OrderedDict
+import numpy as np
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from aggregates import aggregate_votes_by_name
+from bitmap_cache import BitmapCache
+from data_loader import DATA_FILE, data_fingerprint, load_data
 
 # Initialize Pygame
 pygame.init()
@@ -17,6 +23,18 @@ pygame.display.set_caption("Sales Data Visualization Dashboard")
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
+# Rendered plots are kept on disk between launches, keyed by the CSV fingerprint
+bitmap_cache = BitmapCache(cache_dir=os.path.join(os.path.dirname(os.path.abspath(__file__)), '.bitmap_cache'))
+PLOT_DPI = 100
+PLOT_SIZE = (15 * PLOT_DPI, 8 * PLOT_DPI)
+
+# Level of detail: narrowest bar (in pixels) that still fits a rotated label
+MIN_BAR_PX = 10
+
+# Function to pick how many bars fit on a surface of the given width
+def lod_bar_count(surface_width, min_bar_px=MIN_BAR_PX):
+    return max(2, int(surface_width // min_bar_px))
+
 # Function to display text
 def draw_text(text, font, color, surface, x, y):
     text_obj = font.render(text, True, color)
@@ -24,60 +42,236 @@ def draw_text(text, font, color, surface, x, y):
     text_rect.topleft = (x, y)
     surface.blit(text_obj, text_rect)
 
-# Function to plot restaurant votes data
-def plot_sales_data():
-    data = pd.read_csv('Zomato data .csv')  # Correct file path
-    
-    # Set up seaborn style for a cleaner look
-    sns.set(style="whitegrid")
-    
-    # Create a larger figure to handle many labels
-    plt.figure(figsize=(15, 8))
+# Function to draw the restaurant votes chart into a Figure from votes already
+# reduced per name, so drawing cost depends on the bar count, not the row count
+def draw_sales_votes(fig, votes):
+    ax = fig.subplots()
     
     # Plot with better readability and style
-    sns.barplot(x='name', y='votes', data=data, palette="Blues_d")
+    positions = np.arange(len(votes))
+    ax.bar(positions, votes.to_numpy(dtype=np.float64, na_value=np.nan), color=sns.color_palette("Blues_d", len(votes)), width=0.8)
+    ax.set_xticks(positions, votes.index)
+    ax.set_xlim(-0.5, len(votes) - 0.5)
     
     # Improve x-axis labels
-    plt.xticks(rotation=90, fontsize=8)
-    plt.yticks(fontsize=10)
-    plt.xlabel("Restaurant Name", fontsize=12)
-    plt.ylabel("Votes", fontsize=12)
+    ax.tick_params(axis='x', labelrotation=90, labelsize=8)
+    ax.tick_params(axis='y', labelsize=10)
+    ax.set_xlabel("Restaurant Name", fontsize=12)
+    ax.set_ylabel("Votes", fontsize=12)
     
     # Add title and tighten layout
-    plt.title("Votes for Restaurants", fontsize=16)
-    plt.tight_layout()
-    
-    # Save the plot to an image
-    plt.savefig('C:/Users/bkani/OneDrive/文档/Desktop/Sales_Visualization/votes_plot_cleaned.png')  # Updated path
+    ax.set_title("Votes for Restaurants", fontsize=16)
+    fig.tight_layout()
 
-    # Load the plot image into Pygame
-    plot_image = pygame.image.load('C:/Users/bkani/OneDrive/文档/Desktop/Sales_Visualization/votes_plot_cleaned.png')  # Updated path
-    return plot_image
+# Function to wrap an RGBA array/buffer as a Pygame surface without copying it.
+# The surface keeps a reference to the buffer, so it stays valid.
+def surface_from_rgba(rgba, size):
+    return pygame.image.frombuffer(rgba, size, 'RGBA')
 
-# Main loop
-def main():
-    font = pygame.font.SysFont(None, 40)
-    clock = pygame.time.Clock()
+# Function to plot restaurant votes data straight from the Agg canvas buffer.
+# Set SALES_PLOT_EXPORT (or pass export_path) to also save the chart to disk.
+def plot_sales_data(export_path=None):
+    if export_path is None:
+        export_path = os.environ.get('SALES_PLOT_EXPORT')
+    key = BitmapCache.make_key('votes_for_restaurants', data_fingerprint(DATA_FILE), PLOT_SIZE, PLOT_DPI)
+    cached = bitmap_cache.get(key)
+    if cached is not None and not export_path:
+        height, width = cached.shape[:2]
+        return surface_from_rgba(cached, (width, height))
+
+    data = load_data()
+    votes = aggregate_votes_by_name(data, top_k=lod_bar_count(PLOT_SIZE[0]))
+    
+    # Set up seaborn style for a cleaner look
+    sns.set(style="whitegrid")
     
-    # Plot sales data and load it as a Pygame image
-    sales_plot = plot_sales_data()
+    # Create a larger figure to handle many labels (Agg only, no pyplot window)
+    fig = Figure(figsize=(PLOT_SIZE[0] / PLOT_DPI, PLOT_SIZE[1] / PLOT_DPI), dpi=PLOT_DPI)
+    canvas = FigureCanvasAgg(fig)
+    draw_sales_votes(fig, votes)
+    canvas.draw()
+    
+    # Hand the canvas memory to Pygame directly: no PNG encode, disk round-trip or copy
+    rgba = np.asarray(canvas.buffer_rgba())
+    bitmap_cache.put(key, rgba)
+    if export_path:
+        fig.savefig(export_path)
+    return surface_from_rgba(rgba, canvas.get_width_height())
 
-    while True:
-        screen.fill(WHITE)
-        
-        draw_text('Restaurant Votes Dashboard', font, BLACK, screen, 20, 20)
+# Event loop: blocks on pygame.event.wait and only repaints what changed.
+# The timeout is just for noticing a new CSV export; an idle display costs
+# next to no CPU.
+IDLE_TIMEOUT_MS = 1000
+TILE_SIZE = 256
+ZOOM_LEVELS = (0.5, 0.75, 1.0, 1.5, 2.0)
+CACHED_ZOOM_LEVELS = 3
+PAN_STEP = 40
+VIEWPORT = pygame.Rect(50, 100, screen_width - 50, screen_height - 100)
 
-        # Display sales plot
-        screen.blit(sales_plot, (50, 100))  # Adjust as needed for positioning
+# The plot cut into fixed-size tiles, per zoom level. A level is scaled once
+# and its tiles are subsurfaces of it (no copies); only the most recently used
+# levels are kept.
+class TiledPlot:
+    def __init__(self, surface, tile_size=TILE_SIZE, cached_levels=CACHED_ZOOM_LEVELS):
+        self.surface = surface
+        self.tile_size = tile_size
+        self.cached_levels = cached_levels
+        self._levels = OrderedDict()
 
-        # Event handling
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # Function to get the scaled plot and its tiles for a zoom level
+    def level(self, zoom):
+        if zoom in self._levels:
+            self._levels.move_to_end(zoom)
+            return self._levels[zoom]
+        width, height = self.surface.get_size()
+        scaled = self.surface if zoom == 1 else pygame.transform.smoothscale(
+            self.surface, (round(width * zoom), round(height * zoom)))
+        scaled = scaled.convert()  # The plot is opaque: display format, no per-pixel alpha, plain copies
+        tiles = {}
+        for y in range(0, scaled.get_height(), self.tile_size):
+            for x in range(0, scaled.get_width(), self.tile_size):
+                rect = pygame.Rect(x, y, self.tile_size, self.tile_size).clip(scaled.get_rect())
+                tiles[x // self.tile_size, y // self.tile_size] = scaled.subsurface(rect)
+        self._levels[zoom] = (scaled.get_size(), tiles)
+        while len(self._levels) > self.cached_levels:
+            self._levels.popitem(last=False)
+        return self._levels[zoom]
 
-        pygame.display.update()
-        clock.tick(60)
+    # Function to blit only the tiles visible through `rect`, scrolled by `offset`
+    def blit(self, target, rect, offset, zoom):
+        _, tiles = self.level(zoom)
+        first_x, first_y = offset[0] // self.tile_size, offset[1] // self.tile_size
+        last_x = (offset[0] + rect.width - 1) // self.tile_size
+        last_y = (offset[1] + rect.height - 1) // self.tile_size
+        target.set_clip(rect)
+        target.fill(WHITE, rect)
+        target.blits([(tiles[x, y], (rect.x + x * self.tile_size - offset[0], rect.y + y * self.tile_size - offset[1]))
+                      for y in range(first_y, last_y + 1) for x in range(first_x, last_x + 1) if (x, y) in tiles],
+                     doreturn=False)
+        target.set_clip(None)
+
+# Pan and zoom state of the plot shown in a viewport rectangle
+class PlotView:
+    def __init__(self, plot, rect=VIEWPORT):
+        self.plot = plot
+        self.rect = rect
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+        self.offset = [0, 0]
+
+    @property
+    def zoom(self):
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def _clamp(self):
+        width, height = self.plot.level(self.zoom)[0]
+        self.offset[0] = max(0, min(self.offset[0], width - self.rect.width))
+        self.offset[1] = max(0, min(self.offset[1], height - self.rect.height))
+
+    # Function to scroll the plot; returns True if anything moved
+    def pan(self, dx, dy):
+        before = tuple(self.offset)
+        self.offset[0] += dx
+        self.offset[1] += dy
+        self._clamp()
+        return tuple(self.offset) != before
+
+    # Function to step the zoom level, keeping the plot point under `pos` in place
+    def zoom_by(self, steps, pos=None):
+        index = max(0, min(self.zoom_index + steps, len(ZOOM_LEVELS) - 1))
+        if index == self.zoom_index:
+            return False
+        if pos is None:
+            pos = self.rect.center
+        anchor = (pos[0] - self.rect.x, pos[1] - self.rect.y)
+        scale = ZOOM_LEVELS[index] / self.zoom
+        self.offset = [round((self.offset[0] + anchor[0]) * scale - anchor[0]),
+                       round((self.offset[1] + anchor[1]) * scale - anchor[1])]
+        self.zoom_index = index
+        self._clamp()
+        return True
+
+    def reset(self):
+        changed = self.zoom != 1.0 or self.offset != [0, 0]
+        self.zoom_index = ZOOM_LEVELS.index(1.0)
+        self.offset = [0, 0]
+        return changed
+
+    # Function to draw the view and return the rectangle that needs updating
+    def draw(self, target):
+        self.plot.blit(target, self.rect, self.offset, self.zoom)
+        return self.rect
+
+# Function to paint the whole window (first frame, after an expose, or new data)
+def draw_frame(view, font, hint_font):
+    screen.fill(WHITE)
+    draw_text('Restaurant Votes Dashboard', font, BLACK, screen, 20, 20)
+    draw_text('Drag or use the arrow keys to pan, scroll or +/- to zoom, Home to reset',
+              hint_font, BLACK, screen, 20, 60)
+    view.draw(screen)
+    return screen.get_rect()
+
+def is_quit(event):
+    return event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE)
+
+# Function to apply one event to the view; returns the dirty rectangle, if any
+def handle_event(event, view):
+    changed = False
+    if event.type == pygame.MOUSEMOTION and event.buttons[0]:
+        changed = view.pan(-event.rel[0], -event.rel[1])
+    elif event.type == pygame.MOUSEWHEEL:
+        changed = view.zoom_by(event.y, pygame.mouse.get_pos())
+    elif event.type == pygame.KEYDOWN:
+        moves = {pygame.K_LEFT: (-PAN_STEP, 0), pygame.K_RIGHT: (PAN_STEP, 0),
+                 pygame.K_UP: (0, -PAN_STEP), pygame.K_DOWN: (0, PAN_STEP)}
+        if event.key in moves:
+            changed = view.pan(*moves[event.key])
+        elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            changed = view.zoom_by(1)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            changed = view.zoom_by(-1)
+        elif event.key == pygame.K_HOME:
+            changed = view.reset()
+    return view.rect if changed else None
+
+# Function to run the event loop until the window is closed
+def run():
+    font = pygame.font.SysFont(None, 40)
+    hint_font = pygame.font.SysFont(None, 22)
+    fingerprint = data_fingerprint(DATA_FILE)
+    view = PlotView(TiledPlot(plot_sales_data()))
+    pygame.event.set_blocked(None)  # Don't wake up for events we ignore anyway
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+                              pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED])
+    dirty = [draw_frame(view, font, hint_font)]
+
+    while True:
+        pygame.display.update(dirty)
+        dirty = []
+        event = pygame.event.wait(IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            # Idle: repaint only if a new export of the CSV has landed
+            if data_fingerprint(DATA_FILE) != fingerprint:
+                fingerprint = data_fingerprint(DATA_FILE)
+                view.plot = TiledPlot(plot_sales_data())
+                view.pan(0, 0)
+                dirty.append(draw_frame(view, font, hint_font))
+            continue
+        # Handle everything queued up before repainting once (drags send bursts of motion)
+        for event in [event] + pygame.event.get():
+            if is_quit(event):
+                return
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED):
+                dirty.append(draw_frame(view, font, hint_font))
+            elif handle_event(event, view) is not None and view.rect not in dirty:
+                dirty.append(view.rect)
+        if view.rect in dirty:
+            view.draw(screen)
+
+# Main loop
+def main():
+    run()
+    pygame.quit()
+    sys.exit()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,268 @@
+# Local HTTP/JSON service for the dashboard analytics: the same aggregates,
+# query routing and rendered views as dashboard.py, for other tools to call
+# instead of scraping screenshots. Loads the dataset once; identical requests
+# that arrive while one is being computed share its result, and pandas,
+# matplotlib and PNG encoding run on a thread pool, off the event loop.
+#
+#   python service.py --port 8050
+#   curl http://127.0.0.1:8050/api/top-rated
+#   curl "http://127.0.0.1:8050/api/query?q=cheap+places"
+#   curl -o types.png "http://127.0.0.1:8050/render/restaurant_types.png?width=1000&height=600"
+import argparse
+import asyncio
+import io
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from aggregates import AggregateCache, DatasetAggregates, stream_aggregates
+from data_loader import DATA_FILE, SourceSnapshot, load_data, should_stream
+from query_router import route
+from render_engine import FigurePool, render_rgba
+from report import report_views, slugify
+from views import NEEDS_ROWS, QUERY_VIEWS, SIDEBAR_VIEWS
+
+HOST = '127.0.0.1'
+PORT = 8050
+PNG_CACHE_SIZE = 64
+MIN_RENDER_SIZE = 100
+MAX_RENDER_SIZE = 3000
+MAX_DISCARDED_BODY = 64 * 1024  # Bigger request bodies close the connection rather than being read
+
+# Aggregates served as JSON, encoded by pandas straight from the DatasetAggregates summary
+JSON_VIEWS = {
+    '/api/types': lambda summary: summary.category_counts('listed_in(type)').to_json(),
+    '/api/online-order': lambda summary: summary.category_counts('online_order').to_json(),
+    '/api/book-table': lambda summary: summary.category_counts('book_table').to_json(),
+    # Ratings are float32: six decimals keeps 4.6 as 4.6 rather than 4.5999999046
+    '/api/top-rated': lambda summary: summary.top_rated().to_json(orient='records', double_precision=6),
+    '/api/top-voted': lambda summary: summary.top_by_votes().to_json(orient='records'),
+    '/api/price-ranges': lambda summary: summary.price_range_counts().to_json(),
+    '/api/correlation': lambda summary: summary.correlation().to_json(orient='index'),
+}
+
+# View drawn for each query intent, as in dashboard.py's query_handlers ('location' has no figure)
+INTENT_VIEWS = {intent: draw for intent, (draw, _) in QUERY_VIEWS.items()}
+INTENT_VIEWS['type'] = SIDEBAR_VIEWS['Restaurant Types'][0]
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_json(value):
+    return json.dumps(value).encode('utf-8')
+
+
+# Function to read header lines up to the blank line that ends them
+async def read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+
+# Function to get the length of a request body small enough to read and drop.
+# None means it can't be skipped (chunked, too big or a bad Content-Length),
+# so the connection is closed after the response instead of reused.
+def body_length(headers):
+    if 'transfer-encoding' in headers:
+        return None
+    try:
+        length = int(headers.get('content-length', '0'))
+    except ValueError:
+        return None
+    return length if 0 <= length <= MAX_DISCARDED_BODY else None
+
+
+async def write_response(writer, status, content_type, body, keep_alive, head_only=False):
+    head = (f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+            f'Content-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\n'
+            f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+    writer.write(head.encode('latin-1') + (b'' if head_only else body))
+    await writer.drain()
+
+
+class AnalyticsService:
+    def __init__(self, path=DATA_FILE, workers=None):
+        self.path = path
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analytics')
+        self.cache = AggregateCache()
+        self.figure_pool = FigurePool()
+        self.views = {slugify(name): (draw, figsize) for name, draw, figsize in report_views()}
+        self.view_urls = {draw: f'/render/{slug}.png' for slug, (draw, _) in reversed(self.views.items())}
+        self.snapshot = None
+        self.data = None
+        self._png_cache = OrderedDict()
+        self._png_lock = threading.Lock()
+        self._inflight = {}
+
+    # Function to load the dataset and build the summary (blocking, run on the executor)
+    def load(self):
+        self.snapshot = SourceSnapshot(self.path)
+        self.data = None if should_stream(self.path) else load_data(self.path, snapshot=self.snapshot)
+        self.cache.invalidate(self.snapshot.fingerprint)
+        self.summary()
+
+    def summary(self):
+        if self.data is None:
+            return self.cache.get('summary', lambda: stream_aggregates(self.path, end=self.snapshot.size))
+        return self.cache.get('summary', lambda: DatasetAggregates.from_frame(self.data))
+
+    # Function to run blocking work on the executor. Requests with the same key
+    # that come in while it runs wait for the same result instead of redoing it.
+    async def coalesced(self, key, work):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, work)
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)  # A client hanging up doesn't cancel it for the others
+
+    # Request handlers, each returning (content type, body)
+
+    async def json_view(self, path):
+        compute = JSON_VIEWS[path]
+        body = await self.coalesced(('json', path), lambda: self.cache.get(
+            ('json', path), lambda: compute(self.summary()).encode('utf-8')))
+        return 'application/json', body
+
+    async def health(self):
+        body = {'rows': int(self.summary().rows), 'fingerprint': self.cache.fingerprint, 'streaming': self.data is None}
+        return 'application/json', encode_json(body)
+
+    async def query(self, params):
+        query = params.get('q', [''])[0]
+        if not query.strip():
+            raise HttpError(HTTPStatus.BAD_REQUEST, "missing query parameter 'q'")
+        intent = route(query)
+        view = self.view_urls.get(INTENT_VIEWS.get(intent))
+        return 'application/json', encode_json({'query': query, 'intent': intent, 'view': view})
+
+    async def render(self, slug, params):
+        if slug not in self.views:
+            raise HttpError(HTTPStatus.NOT_FOUND, f'unknown view {slug!r}')
+        draw, figsize = self.views[slug]
+        if self.data is None and draw in NEEDS_ROWS:
+            raise HttpError(HTTPStatus.CONFLICT, 'this view needs the full dataset (streaming mode)')
+        try:
+            width = int(params.get('width', [figsize[0] * 100])[0])
+            height = int(params.get('height', [figsize[1] * 100])[0])
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, 'width and height must be integers')
+        if not (MIN_RENDER_SIZE <= width <= MAX_RENDER_SIZE and MIN_RENDER_SIZE <= height <= MAX_RENDER_SIZE):
+            raise HttpError(HTTPStatus.BAD_REQUEST, f'width and height must be {MIN_RENDER_SIZE}-{MAX_RENDER_SIZE}')
+        key = (self.cache.fingerprint, slug, width, height)
+        body = await self.coalesced(('png',) + key, lambda: self._render_png(key, draw, (width, height)))
+        return 'image/png', body
+
+    def _render_png(self, key, draw, size):
+        from PIL import Image
+
+        with self._png_lock:
+            if key in self._png_cache:
+                self._png_cache.move_to_end(key)
+                return self._png_cache[key]
+        summary = self.summary()
+        rgba = render_rgba(lambda fig: draw(fig, summary, self.data), size, pool=self.figure_pool, pane='service')
+        buffer = io.BytesIO()
+        Image.fromarray(rgba).save(buffer, format='PNG', compress_level=3)
+        body = buffer.getvalue()
+        with self._png_lock:
+            self._png_cache[key] = body
+            while len(self._png_cache) > PNG_CACHE_SIZE:
+                self._png_cache.popitem(last=False)
+        return body
+
+    async def dispatch(self, method, target):
+        if method not in ('GET', 'HEAD'):
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f'{method} is not supported')
+        url = urlsplit(target)
+        params = parse_qs(url.query)
+        if url.path in JSON_VIEWS:
+            return await self.json_view(url.path)
+        if url.path == '/health':
+            return await self.health()
+        if url.path == '/api/query':
+            return await self.query(params)
+        if url.path.startswith('/render/') and url.path.endswith('.png'):
+            return await self.render(url.path[len('/render/'):-len('.png')], params)
+        raise HttpError(HTTPStatus.NOT_FOUND, f'no route for {url.path}')
+
+    # Minimal HTTP/1.1 with keep-alive: one request at a time per connection
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    headers = await read_headers(reader)
+                except ValueError:  # A line longer than the reader's limit (64 KiB)
+                    body = encode_json({'error': 'request line or header field too long'})
+                    await write_response(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, 'application/json', body,
+                                         keep_alive=False)
+                    break
+
+                parts = request_line.decode('latin-1').split()
+                length = body_length(headers)
+                keep_alive = (len(parts) == 3 and parts[2] == 'HTTP/1.1' and length is not None
+                              and headers.get('connection', '').lower() != 'close')
+                try:
+                    if len(parts) != 3:
+                        raise HttpError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+                    if length:
+                        await reader.readexactly(length)  # No route takes a body: drop it
+                    status = HTTPStatus.OK
+                    content_type, body = await self.dispatch(parts[0], parts[1])
+                except HttpError as error:
+                    status, content_type, body = error.status, 'application/json', encode_json({'error': str(error)})
+                except Exception as error:
+                    status, content_type, body = (HTTPStatus.INTERNAL_SERVER_ERROR, 'application/json',
+                                                  encode_json({'error': f'{type(error).__name__}: {error}'}))
+                await write_response(writer, status, content_type, body, keep_alive, head_only=parts[:1] == ['HEAD'])
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        await asyncio.get_running_loop().run_in_executor(self.executor, self.load)
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        print(f'Serving {self.summary().rows} rows from {self.path} on http://{host}:{port}', flush=True)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the dashboard aggregates, query routing and views over HTTP')
+    parser.add_argument('--csv', default=DATA_FILE)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--workers', type=int, default=None, help='threads for aggregation and rendering')
+    args = parser.parse_args()
+
+    service = AnalyticsService(args.csv, workers=args.workers)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == '__main__':
+    main()
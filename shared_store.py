@@ -0,0 +1,130 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DATA_FILE, SourceSnapshot, read_csv_typed
+
+# Bump this whenever the on-disk layout changes so old stores get rebuilt
+STORE_VERSION = 2
+CATALOG_FILE = 'catalog.json'
+
+
+# Published columnar copy of a CSV, shared by every process that loads it.
+# Each column is a raw .npy file (text columns as integer codes plus a list of
+# categories), described by a small catalog.json. Processes memory-map the
+# files read-only, so the OS page cache holds the data once however many
+# dashboards, report workers or benchmark runs attach to it.
+
+# Function to work out where the shared store for one version of a CSV lives
+def store_path(path=DATA_FILE, fingerprint=None):
+    if fingerprint is None:
+        fingerprint = SourceSnapshot(path).fingerprint
+    folder, filename = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(filename)[0].strip().replace(' ', '_')
+    return os.path.join(folder, f'.{stem}.{fingerprint}.columns')
+
+
+# Function to pick the smallest integer type that holds the category codes
+def _code_dtype(categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if len(categories) < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+# Function to write a frame as a store: one file per column and the catalog last.
+# The folder is built under a temporary name and renamed into place, so other
+# processes either see a complete store or none at all.
+def publish(data, target, fingerprint):
+    tmp_path = f'{target}.tmp{os.getpid()}'
+    os.makedirs(tmp_path)
+    columns = []
+    for position, column in enumerate(data.columns):
+        entry = {'name': column, 'file': f'{position}.npy'}
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, categories = values.cat.codes.to_numpy(), values.cat.categories
+        elif not pd.api.types.is_numeric_dtype(values):
+            codes, categories = pd.factorize(values)  # Text columns are dictionary-encoded
+        else:
+            codes = None
+        if codes is not None:
+            entry['kind'] = 'category'
+            entry['categories'] = f'{position}.categories.json'
+            with open(os.path.join(tmp_path, entry['categories']), 'w') as handle:
+                json.dump(categories.tolist(), handle)
+            np.save(os.path.join(tmp_path, entry['file']), codes.astype(_code_dtype(categories)))
+        elif isinstance(values.array, pd.arrays.IntegerArray):
+            # Nullable integers (votes, cost): the values plus a mask of the blank cells
+            entry['kind'] = 'nullable'
+            entry['mask'] = f'{position}.mask.npy'
+            np.save(os.path.join(tmp_path, entry['file']),
+                    values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0))
+            np.save(os.path.join(tmp_path, entry['mask']), values.isna().to_numpy())
+        else:
+            entry['kind'] = 'numeric'
+            np.save(os.path.join(tmp_path, entry['file']), values.to_numpy())
+        columns.append(entry)
+
+    catalog = {'version': STORE_VERSION, 'fingerprint': fingerprint, 'rows': len(data), 'columns': columns}
+    with open(os.path.join(tmp_path, CATALOG_FILE), 'w') as handle:
+        json.dump(catalog, handle, indent=1)
+    try:
+        os.rename(tmp_path, target)
+    except OSError:
+        shutil.rmtree(tmp_path, ignore_errors=True)  # Another process published it first
+
+
+# Function to attach to a store: read-only, zero-copy column views over the mapped files
+def attach(target):
+    with open(os.path.join(target, CATALOG_FILE)) as handle:
+        catalog = json.load(handle)
+    if catalog['version'] != STORE_VERSION:
+        raise ValueError(f'{target} has store version {catalog["version"]}, expected {STORE_VERSION}')
+    columns = {}
+    for entry in catalog['columns']:
+        values = np.load(os.path.join(target, entry['file']), mmap_mode='r')
+        if entry['kind'] == 'category':
+            with open(os.path.join(target, entry['categories'])) as handle:
+                categories = json.load(handle)
+            values = pd.Categorical.from_codes(values, categories=categories, validate=False)
+        elif entry['kind'] == 'nullable':
+            mask = np.load(os.path.join(target, entry['mask']), mmap_mode='r')
+            values = pd.arrays.IntegerArray(values, mask)
+        columns[entry['name']] = values
+    return pd.DataFrame(columns, copy=False)
+
+
+# Function to drop stores left behind by older versions of the CSV. Processes
+# still attached keep their mappings; the space is freed once they let go.
+def _remove_stale_stores(keep):
+    folder = os.path.dirname(keep)
+    prefix = os.path.basename(keep).rsplit('.', 2)[0] + '.'
+    for entry in os.listdir(folder):
+        full_path = os.path.join(folder, entry)
+        if entry.startswith(prefix) and entry.endswith('.columns') and full_path != keep:
+            shutil.rmtree(full_path, ignore_errors=True)
+
+
+# Function to load the dataset through the shared store: attach if this version
+# of the CSV is already published, otherwise parse it, publish it, and attach
+def load_shared(path=DATA_FILE, snapshot=None):
+    if snapshot is None:
+        snapshot = SourceSnapshot(path)
+    target = store_path(path, snapshot.fingerprint)
+    try:
+        return attach(target)
+    except (OSError, ValueError, KeyError):
+        pass  # Not published yet, or left by an older version
+
+    data = read_csv_typed(path, end=snapshot.size)
+    try:
+        shutil.rmtree(target, ignore_errors=True)
+        publish(data, target, snapshot.fingerprint)
+        _remove_stale_stores(keep=target)
+        return attach(target)
+    except OSError:
+        return data  # Read-only data folder, keep the private copy
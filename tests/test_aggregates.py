@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib import cbook
+
+from aggregates import (CATEGORY_COLUMNS, COST_BINS, NUMERIC_COLUMNS, RATE_BINS, TOP_RATED, TOP_VOTES,
+                        AggregateColumns, DatasetAggregates, stream_aggregates)
+from data_loader import COST_COLUMN, DATA_FILE, read_csv_typed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CSV_PATH = os.path.join(ROOT, DATA_FILE)
+
+
+@pytest.fixture(scope='module')
+def data():
+    return read_csv_typed(CSV_PATH)
+
+
+# Function to build the aggregates every supported way: whole frame, chunk by
+# chunk, merged from separately built parts, and streamed from the CSV
+def built_every_way(data):
+    whole = DatasetAggregates.from_frame(data)
+    chunked = DatasetAggregates()
+    for start in range(0, len(data), 17):
+        chunked.update(data.iloc[start:start + 17])
+    merged = DatasetAggregates()
+    for start in range(0, len(data), 40):
+        merged.merge(DatasetAggregates.from_frame(data.iloc[start:start + 40]))
+    streamed = stream_aggregates(CSV_PATH, chunksize=25)
+    return {'whole': whole, 'chunked': chunked, 'merged': merged, 'streamed': streamed}
+
+
+def test_counts_and_histograms_match_pandas(data):
+    for way, summary in built_every_way(data).items():
+        assert summary.rows == len(data), way
+        for column in CATEGORY_COLUMNS:
+            expected = data[column].value_counts()
+            pd.testing.assert_series_equal(summary.category_counts(column).sort_index(),
+                                           expected[expected > 0].sort_index(), check_names=False,
+                                           check_index_type=False, check_categorical=False)
+        rates = data['rate'].dropna().to_numpy(dtype=np.float64)
+        assert np.array_equal(summary.rate_hist, np.histogram(rates, bins=RATE_BINS)[0]), way
+        costs = data[COST_COLUMN].dropna().to_numpy(dtype=np.float64)
+        assert np.array_equal(summary.cost_hist, np.histogram(costs, bins=COST_BINS)[0]), way
+
+
+def test_correlation_matches_pandas(data):
+    expected = data[NUMERIC_COLUMNS].astype('float64').dropna().corr()
+    for way, summary in built_every_way(data).items():
+        np.testing.assert_allclose(summary.correlation().to_numpy(), expected.to_numpy(), rtol=1e-9, err_msg=way)
+
+
+def test_top_lists_match_pandas(data):
+    top_votes = data.nlargest(TOP_VOTES, 'votes', keep='first')
+    top_rated = data.nlargest(TOP_RATED, 'rate', keep='first')
+    for way, summary in built_every_way(data).items():
+        assert summary.top_by_votes()['votes'].tolist() == top_votes['votes'].tolist(), way
+        assert summary.top_by_votes()['name'].tolist() == top_votes['name'].tolist(), way
+        assert summary.top_rated()['rate'].tolist() == top_rated['rate'].tolist(), way
+        assert summary.top_rated()['name'].tolist() == top_rated['name'].tolist(), way
+
+
+def test_box_stats_match_matplotlib(data):
+    for way, summary in built_every_way(data).items():
+        for column in CATEGORY_COLUMNS:
+            for stats in summary.rate_box_stats(column):
+                rates = data.loc[data[column] == stats['label'], 'rate'].dropna().to_numpy(dtype=np.float64)
+                expected = cbook.boxplot_stats(np.round(rates, 1))[0]
+                for key in ('med', 'q1', 'q3', 'whislo', 'whishi', 'mean'):
+                    assert stats[key] == pytest.approx(expected[key]), (way, column, stats['label'], key)
+                assert sorted(stats['fliers']) == pytest.approx(sorted(set(expected['fliers']))), (way, column)
+
+
+def test_costs_above_the_top_edge_go_to_the_overflow_bin(data):
+    outliers = data.head(3).copy()
+    outliers[COST_COLUMN] = pd.array([5999, 6000, 25000], dtype='Int32')
+    summary = DatasetAggregates.from_frame(outliers)
+    assert np.isinf(COST_BINS[-1])
+    assert summary.cost_hist[-2:].tolist() == [1, 2]
+
+
+def assert_same_summary(summary, expected):
+    assert summary.rows == expected.rows
+    for column in CATEGORY_COLUMNS:
+        pd.testing.assert_series_equal(summary.category_counts(column).sort_index(),
+                                       expected.category_counts(column).sort_index(), check_names=False,
+                                       check_index_type=False, check_categorical=False)
+        assert str(summary.rate_box_stats(column)) == str(expected.rate_box_stats(column))
+    assert np.array_equal(summary.rate_hist, expected.rate_hist)
+    assert np.array_equal(summary.cost_hist, expected.cost_hist)
+    pd.testing.assert_series_equal(summary.price_range_counts(), expected.price_range_counts())
+    assert summary.cuisine_frequencies() == expected.cuisine_frequencies()
+    np.testing.assert_allclose(summary.correlation().to_numpy(), expected.correlation().to_numpy(), rtol=1e-9)
+    pd.testing.assert_frame_equal(summary.top_by_votes(), expected.top_by_votes())
+    pd.testing.assert_frame_equal(summary.top_rated(), expected.top_rated())
+
+
+@pytest.mark.parametrize('selection', ['all', 'dining', 'online', 'none', 'every_third'])
+def test_from_positions_matches_from_frame(data, selection):
+    masks = {'all': np.ones(len(data), dtype=bool),
+             'dining': (data['listed_in(type)'] == 'Dining').to_numpy(),
+             'online': (data['online_order'] == 'Yes').to_numpy(),
+             'none': np.zeros(len(data), dtype=bool),
+             'every_third': np.arange(len(data)) % 3 == 0}
+    positions = np.flatnonzero(masks[selection])
+    summary = DatasetAggregates.from_positions(AggregateColumns(data), positions)
+    assert_same_summary(summary, DatasetAggregates.from_frame(data.take(positions)))
+
+
+def test_appended_columns_match_a_rebuild(data):
+    data = data.copy()
+    data['listed_in(type)'] = data['listed_in(type)'].astype(str)
+    data.loc[data.index[-5:], 'listed_in(type)'] = 'Pubs'  # Only in the appended rows
+    data['cuisines'] = np.where(np.arange(len(data)) % 2, 'North Indian, Chinese', 'Cafe')
+    data.loc[data.index[-3:], 'cuisines'] = 'Biryani'
+    columns = AggregateColumns(data.iloc[:60])
+    before = columns.copy()
+    columns.append(data.iloc[60:100])
+    columns.append(data.iloc[100:])
+    positions = np.flatnonzero((data['votes'] > 100).to_numpy())
+    summary = DatasetAggregates.from_positions(columns, positions)
+    assert_same_summary(summary, DatasetAggregates.from_frame(data.take(positions)))
+    assert summary.counts['listed_in(type)']['Pubs'] == (data.take(positions)['listed_in(type)'] == 'Pubs').sum()
+    assert before.rows == 60 and len(before.numeric) == 60
@@ -0,0 +1,140 @@
+import os
+
+import pandas as pd
+import pytest
+
+from data_loader import (APPENDED, COST_COLUMN, DATA_FILE, REWRITTEN, UNCHANGED, SourceSnapshot, append_rows,
+                         read_csv_typed)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NEW_ROWS = ('Fresh Bakes,Yes,No,4.2/5,"1,024",400,Cafes\n'
+            'Night Owl,No,Yes,3.6/5,85,1200,Late Night\n')
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    with open(os.path.join(ROOT, DATA_FILE), 'rb') as handle:
+        lines = handle.readlines()
+    path = tmp_path / 'zomato.csv'
+    path.write_bytes(b''.join(lines[:101]))  # Header and 100 rows
+    return str(path)
+
+
+def append(path, text):
+    with open(path, 'a', newline='') as handle:
+        handle.write(text)
+
+
+def test_unchanged(csv_path):
+    assert SourceSnapshot(csv_path).change_to(SourceSnapshot(csv_path)) == UNCHANGED
+
+
+def test_append(csv_path):
+    before = SourceSnapshot(csv_path)
+    append(csv_path, NEW_ROWS)
+    after = SourceSnapshot(csv_path)
+    assert before.change_to(after) == APPENDED
+    new_rows = pd.concat(before.iter_appended(after))
+    assert new_rows['name'].tolist() == ['Fresh Bakes', 'Night Owl']
+    assert new_rows['votes'].tolist() == [1024, 85]
+
+
+def test_rewrite_in_place(csv_path):
+    before = SourceSnapshot(csv_path)
+    with open(csv_path, 'r+b') as handle:
+        handle.seek(before.size - 20)
+        handle.write(b'X')
+    append(csv_path, NEW_ROWS)
+    assert before.change_to(SourceSnapshot(csv_path)) == REWRITTEN
+
+
+def test_rewrite_shorter(csv_path):
+    before = SourceSnapshot(csv_path)
+    with open(csv_path, 'rb') as handle:
+        lines = handle.readlines()
+    with open(csv_path, 'wb') as handle:
+        handle.write(b''.join(lines[:50]))
+    assert before.change_to(SourceSnapshot(csv_path)) == REWRITTEN
+
+
+def test_partial_line_is_left_for_later(csv_path):
+    before = SourceSnapshot(csv_path)
+    append(csv_path, NEW_ROWS + 'Half Wri')
+    partial = SourceSnapshot(csv_path)
+    assert partial.lines_end == os.path.getsize(csv_path) - len('Half Wri')
+    assert before.change_to(partial) == APPENDED
+    assert len(pd.concat(before.iter_appended(partial))) == 2
+
+    read = partial.complete_lines()
+    append(csv_path, 'tten,Yes,No,4.0/5,10,300,Buffet\n')
+    complete = SourceSnapshot(csv_path)
+    assert read.change_to(complete) == APPENDED
+    assert pd.concat(read.iter_appended(complete))['name'].tolist() == ['Half Written']
+
+
+def test_partial_line_alone_is_unchanged(csv_path):
+    before = SourceSnapshot(csv_path)
+    append(csv_path, 'Half Wri')
+    assert before.change_to(SourceSnapshot(csv_path)) == UNCHANGED
+
+
+def test_append_rows_matches_full_parse(csv_path):
+    before = SourceSnapshot(csv_path)
+    loaded = read_csv_typed(csv_path, end=before.size)
+    append(csv_path, NEW_ROWS)
+    after = SourceSnapshot(csv_path)
+    combined = append_rows(loaded, list(before.iter_appended(after, chunksize=1)))
+
+    full = read_csv_typed(csv_path)
+    assert combined.dtypes.astype(str).tolist() == full.dtypes.astype(str).tolist()
+    # Categories come out in a different order (appended values last), the values are the same
+    pd.testing.assert_frame_equal(combined, full, check_categorical=False)
+
+
+def test_blank_numbers_parse_as_missing(csv_path):
+    before = SourceSnapshot(csv_path)
+    append(csv_path, 'No Cost Yet,Yes,No,4.0/5,12,,Cafes\nNo Votes Yet,No,No,3.5/5,,500,Buffet\n')
+    after = SourceSnapshot(csv_path)
+    new_rows = pd.concat(before.iter_appended(after))
+    assert new_rows[COST_COLUMN].isna().tolist() == [True, False]
+    assert new_rows['votes'].isna().tolist() == [False, True]
+    assert len(read_csv_typed(csv_path)) == 102
+
+
+@pytest.fixture(params=['\n', '\r\n'], ids=['lf', 'crlf'])
+def unterminated_path(csv_path, request):
+    with open(csv_path, 'rb') as handle:
+        text = handle.read().decode('utf-8')
+    with open(csv_path, 'wb') as handle:
+        handle.write(text.rstrip('\n').replace('\n', request.param).encode('utf-8'))  # No newline after the last row
+    return csv_path, request.param
+
+
+def test_full_load_reads_last_line_without_newline(unterminated_path):
+    path, _ = unterminated_path
+    snapshot = SourceSnapshot(path)
+    assert snapshot.size == snapshot.end == os.path.getsize(path) > snapshot.lines_end
+    loaded = read_csv_typed(path, end=snapshot.size)
+    assert len(loaded) == 100
+    assert loaded['name'].iloc[-1] == read_csv_typed(path)['name'].iloc[-1]
+
+
+def test_append_after_last_line_without_newline(unterminated_path):
+    path, newline = unterminated_path
+    before = SourceSnapshot(path)
+    loaded = read_csv_typed(path, end=before.size)
+    append(path, newline + NEW_ROWS.replace('\n', newline))
+    after = SourceSnapshot(path)
+    assert before.change_to(after) == APPENDED
+    combined = append_rows(loaded, list(before.iter_appended(after)))
+    pd.testing.assert_frame_equal(combined, read_csv_typed(path), check_categorical=False)
+
+
+def test_last_line_added_to_after_load_is_read_again(unterminated_path):
+    path, newline = unterminated_path
+    before = SourceSnapshot(path)
+    append(path, 's')  # The row read as "..., Dining" turns out to be "..., Dinings"
+    assert before.change_to(SourceSnapshot(path)) == UNCHANGED
+    append(path, newline + NEW_ROWS.replace('\n', newline))
+    assert before.change_to(SourceSnapshot(path)) == REWRITTEN
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from data_loader import DATA_FILE, read_csv_typed
+from filter_index import FILTERS, FilterIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def data():
+    data = read_csv_typed(os.path.join(ROOT, DATA_FILE))
+    # A type that only shows up in the last rows, so appending has to add a new bitmap
+    data['listed_in(type)'] = data['listed_in(type)'].astype(str)
+    data.loc[data.index[-5:], 'listed_in(type)'] = 'Pubs'
+    return data
+
+
+def assert_same_index(index, expected):
+    assert index.rows == expected.rows
+    for dimension in FILTERS:
+        assert set(index.bitmaps[dimension]) == set(expected.bitmaps[dimension]), dimension
+        for value, bitmap in expected.bitmaps[dimension].items():
+            assert np.array_equal(index.bitmaps[dimension][value], bitmap), (dimension, value)
+
+
+@pytest.mark.parametrize('split', [0, 1, 8, 13, 100])
+def test_append_matches_rebuild(data, split):
+    index = FilterIndex(data.iloc[:split])
+    index.append(data.iloc[split:])
+    assert_same_index(index, FilterIndex(data))
+
+
+def test_append_in_many_chunks_matches_rebuild(data):
+    index = FilterIndex(data.iloc[:0])
+    for start in range(0, len(data), 7):
+        index.append(data.iloc[start:start + 7])
+    assert_same_index(index, FilterIndex(data))
+
+
+def test_append_leaves_copies_alone(data):
+    index = FilterIndex(data.iloc[:50])
+    before = FilterIndex(data.iloc[:50])
+    copied = index.copy()
+    copied.append(data.iloc[50:])
+    assert_same_index(index, before)
+    assert_same_index(copied, FilterIndex(data))
+
+
+def test_selection_matches_pandas(data):
+    index = FilterIndex(data.iloc[:60])
+    index.append(data.iloc[60:])
+    filters = {'listed_in(type)': ['Pubs', 'Dining'], 'online_order': ['Yes']}
+    expected = np.flatnonzero(data['listed_in(type)'].isin(filters['listed_in(type)'])
+                              & (data['online_order'] == 'Yes'))
+    assert np.array_equal(index.positions(filters), expected)
+    assert index.count(filters) == len(expected)
+    assert index.positions({}) is None and index.count({}) == len(data)
@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from render_engine import RenderEngine
+
+
+# Stands in for the Tk root: after() callbacks are queued and run by run_pending()
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+        self.reported = []
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+    def report_callback_exception(self, exc_type, error, traceback):
+        self.reported.append(error)
+
+    def run_pending(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback in scheduled:
+            callback()
+
+
+@pytest.fixture
+def engine():
+    engine = RenderEngine(FakeRoot())
+    yield engine
+    engine.shutdown()
+
+
+def wait_for_results(engine, expected):
+    deadline = time.monotonic() + 10
+    while engine._finished.qsize() < expected:
+        assert time.monotonic() < deadline, 'jobs did not finish'
+        time.sleep(0.01)
+
+
+def fail(error):
+    raise error
+
+
+def test_results_still_delivered_after_a_callback_raises(engine):
+    delivered = []
+
+    def on_done(value):
+        if value == 'first':
+            raise RuntimeError('callback failed')
+        delivered.append(value)
+
+    engine.submit('main', lambda superseded: 'first', on_done)
+    engine.submit('result', lambda superseded: 'second', on_done)
+    wait_for_results(engine, 2)
+    engine.root.run_pending()
+
+    assert delivered == ['second']
+    assert [str(error) for error in engine.root.reported] == ['callback failed']
+    assert not engine.pending()
+    assert engine.root.scheduled == [] and not engine._polling
+
+
+def test_failing_error_callback_keeps_polling(engine):
+    delivered = []
+    engine.submit('main', lambda superseded: fail(ValueError('job failed')), delivered.append,
+                  on_error=lambda error: fail(RuntimeError(f'on_error failed after {error}')))
+    wait_for_results(engine, 1)
+    engine.root.run_pending()
+    assert [str(error) for error in engine.root.reported] == ['on_error failed after job failed']
+
+    # The engine polls again for the next job instead of being stuck "polling"
+    engine.submit('main', lambda superseded: 'next', delivered.append)
+    assert len(engine.root.scheduled) == 1
+    wait_for_results(engine, 1)
+    engine.root.run_pending()
+    assert delivered == ['next']
@@ -0,0 +1,18 @@
+import os
+
+from report import report_names, slugify
+
+
+def test_report_names_use_the_file_name():
+    assert report_names(['Zomato data .csv', os.path.join('data', 'Pune.csv')]) == ['zomato_data', 'pune']
+
+
+def test_report_names_tell_apart_csvs_with_the_same_file_name():
+    paths = [os.path.join('delhi', 'zomato.csv'), os.path.join('pune', 'zomato.csv'), 'bangalore.csv']
+    assert report_names(paths) == ['delhi_zomato', 'pune_zomato', 'bangalore']
+
+
+def test_report_names_number_what_is_still_the_same():
+    paths = [os.path.join('a', 'pune.csv'), os.path.join('b', 'a', 'pune.csv'), 'zomato.csv', 'zomato.csv']
+    here = slugify(os.path.basename(os.getcwd()))
+    assert report_names(paths) == ['a_pune', 'a_pune_2', f'{here}_zomato', f'{here}_zomato_2']
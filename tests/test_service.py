@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from service import AnalyticsService
+
+
+# Function to run a local server whose routes just echo the method and target,
+# send it raw bytes on one connection and collect the responses
+async def exchange(payload, responses):
+    service = AnalyticsService()
+
+    async def echo(method, target):
+        return 'text/plain', f'{method} {target}'.encode('latin-1')
+
+    service.dispatch = echo
+    server = await asyncio.start_server(service.handle_connection, '127.0.0.1', 0)
+    try:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(payload)
+        await writer.drain()
+        results = []
+        for _ in range(responses):
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers['content-length']))
+            results.append((status, headers['connection'], body))
+        closed = await asyncio.wait_for(reader.read(), timeout=5) == b''
+        writer.close()
+        return results, closed
+    finally:
+        server.close()
+        service.executor.shutdown()
+
+
+def run(payload, responses):
+    return asyncio.run(exchange(payload, responses))
+
+
+def test_request_body_is_skipped_on_keep_alive():
+    payload = (b'POST /api/types HTTP/1.1\r\nContent-Length: 11\r\n\r\nhello=world'
+               b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n')
+    results, closed = run(payload, 2)
+    assert results == [(200, 'keep-alive', b'POST /api/types'), (200, 'close', b'GET /health')]
+    assert closed
+
+
+@pytest.mark.parametrize('headers', [b'Transfer-Encoding: chunked\r\n', b'Content-Length: 10000000\r\n',
+                                     b'Content-Length: ten\r\n'])
+def test_unskippable_body_closes_the_connection(headers):
+    results, closed = run(b'POST /api/types HTTP/1.1\r\n' + headers + b'\r\n', 1)
+    assert results[0][:2] == (200, 'close')
+    assert closed
+
+
+def test_oversized_header_line_gets_431():
+    results, closed = run(b'GET /health HTTP/1.1\r\nX-Big: ' + b'a' * 70_000 + b'\r\n\r\n', 1)
+    assert results[0][:2] == (431, 'close')
+    assert closed
@@ -0,0 +1,313 @@
+import functools
+
+import numpy as np
+import seaborn as sns
+
+from data_loader import COST_COLUMN
+
+# Drawing code for every dashboard view. Each function only touches the Figure
+# it is given (no pyplot, no Tk), so views can be rendered on worker threads
+# or without a window at all. `summary` is a DatasetAggregates and `data` the
+# full DataFrame, which is None in streaming mode.
+
+# Above this many rows, scatters become 2-D density images and KDEs are
+# computed from binned counts, so drawing time no longer grows with the data
+DENSITY_THRESHOLD = 20_000
+KDE_GRID = 1024
+SCATTER_BINS = (80, 60)
+
+# Word cloud layouts kept, one per (cuisine counts, canvas size)
+WORDCLOUD_CACHE_SIZE = 8
+
+
+# Function to plot a fixed-bin histogram, trimmed to the bins that have data
+def _hist_from_counts(ax, edges, counts):
+    used = np.flatnonzero(counts)
+    if len(used):
+        ax.hist(edges[:-1], bins=edges[used[0]:used[-1] + 2], weights=counts)
+
+
+# Function to estimate a Gaussian KDE from histogram counts on an even grid by
+# convolving them with the kernel by FFT. Uses Scott's bandwidth, like seaborn,
+# from `std` if given or else from the binned values, and returns
+# (bin centres, density) or None if there is no spread.
+def kde_from_counts(counts, edges, std=None):
+    counts = np.asarray(counts, dtype=np.float64)
+    total = counts.sum()
+    step = edges[1] - edges[0]
+    centres = edges[:-1] + step / 2
+    if total < 2:
+        return None
+    if std is None:
+        mean = (centres * counts).sum() / total
+        std = np.sqrt(((centres - mean) ** 2 * counts).sum() / (total - 1))
+    if std == 0:
+        return None
+    bandwidth = std * total ** (-1 / 5)
+    grid_size = len(counts)
+    half = min(grid_size - 1, int(np.ceil(4 * bandwidth / step)))
+    kernel = np.exp(-0.5 * (np.arange(-half, half + 1) * step / bandwidth) ** 2)
+    kernel /= kernel.sum() * step
+    size = 1 << (grid_size + 2 * half - 1).bit_length()
+    smoothed = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    return centres, np.clip(smoothed[half:half + grid_size], 0, None) / total
+
+
+# Function to estimate a Gaussian KDE from raw values: they are binned on a fine
+# grid first, then smoothed by kde_from_counts()
+def binned_kde(values, grid_size=KDE_GRID):
+    values = values[np.isfinite(values)]
+    if len(values) < 2 or values.std() == 0:
+        return None
+    counts, edges = np.histogram(values, bins=grid_size)
+    return kde_from_counts(counts, edges, std=values.std(ddof=1))
+
+
+# Function to draw a histogram with a KDE line: seaborn for small data,
+# numpy binning plus binned_kde() above DENSITY_THRESHOLD
+def _histplot(ax, series, bins):
+    if len(series) <= DENSITY_THRESHOLD:
+        sns.histplot(series, bins=bins, kde=True, ax=ax)
+        return
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return
+    counts, edges = np.histogram(values, bins=bins)
+    _, _, patches = ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.75)
+    kde = binned_kde(values)
+    if kde is not None:
+        grid, density = kde
+        ax.plot(grid, density * len(values) * (edges[1] - edges[0]), color=patches[0].get_facecolor(), alpha=1)
+
+
+# Function to draw y against x: one marker per row for small data, a
+# log-scaled 2-D histogram image above DENSITY_THRESHOLD
+def _scatterplot(fig, ax, data, x, y):
+    if len(data) <= DENSITY_THRESHOLD:
+        sns.scatterplot(x=x, y=y, data=data, ax=ax)
+        return
+    from matplotlib.colors import LogNorm
+
+    xs = data[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    ys = data[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    keep = np.isfinite(xs) & np.isfinite(ys)
+    if not keep.any():
+        return
+    counts, x_edges, y_edges = np.histogram2d(xs[keep], ys[keep], bins=SCATTER_BINS)
+    image = ax.imshow(np.ma.masked_equal(counts.T, 0), origin='lower', aspect='auto', cmap='Blues',
+                      norm=LogNorm(), interpolation='nearest',
+                      extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+    fig.colorbar(image, ax=ax, label='Restaurants')
+
+
+def _rotate_xticks(ax):
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+
+
+# Sidebar views
+
+def draw_restaurant_types(fig, summary, data=None):
+    ax = fig.subplots()
+    restaurant_counts = summary.category_counts('listed_in(type)')
+    ax.pie(restaurant_counts, labels=restaurant_counts.index, autopct='%1.1f%%', startangle=140)
+    ax.set_title("Distribution of Restaurant Types")
+    ax.axis('equal')
+
+
+def draw_votes_distribution(fig, summary, data=None):
+    ax = fig.subplots()
+    sns.barplot(x='name', y='votes', data=summary.top_by_votes(), ax=ax)
+    ax.set_title('Top 20 Restaurants by Votes')
+    ax.set_xlabel('Restaurant Name')
+    ax.set_ylabel('Votes')
+    _rotate_xticks(ax)
+    fig.tight_layout()
+
+
+def draw_rating_distribution(fig, summary, data=None):
+    ax = fig.subplots()
+    _hist_from_counts(ax, *summary.rate_histogram())
+    ax.set_title("Ratings Distribution")
+    ax.set_xlabel("Rating")
+    ax.set_ylabel("Frequency")
+
+
+def draw_online_vs_offline(fig, summary, data=None):
+    ax = fig.subplots()
+    ax.bxp(summary.rate_box_stats('online_order'), patch_artist=True)
+    ax.set_title('Online vs Offline Orders - Ratings')
+    ax.set_xlabel('Online Order')
+    ax.set_ylabel('Rating')
+
+
+def draw_average_cost(fig, summary, data=None):
+    ax = fig.subplots()
+    edges, counts = summary.cost_histogram()
+    edges, counts, overflow = edges[:-1], counts[:-1], counts[-1]  # Last bin: everything above the top edge
+    _hist_from_counts(ax, edges, counts)
+    kde = kde_from_counts(counts, edges)  # The KDE line seaborn drew, from the same binned counts
+    if kde is not None:
+        grid, density = kde
+        used = np.flatnonzero(counts)
+        shown = slice(used[0], used[-1] + 1)  # Over the data's range only, as seaborn does
+        ax.plot(grid[shown], density[shown] * counts.sum() * (edges[1] - edges[0]))
+    if overflow:
+        ax.bar(edges[-1], overflow, width=edges[1] - edges[0], align='edge', color='grey', hatch='//',
+               label=f'{edges[-1]:,.0f} and above')
+        ax.legend()
+    ax.set_title('Distribution of Approximate Cost for Two People')
+    ax.set_xlabel('Cost')
+    ax.set_ylabel('Count')
+
+
+def draw_top_rated(fig, summary, data=None):
+    ax = fig.subplots()
+    sns.barplot(x='name', y='rate', data=summary.top_rated(), ax=ax)
+    ax.set_title('Top 10 Rated Restaurants')
+    ax.set_xlabel('Restaurant Name')
+    ax.set_ylabel('Rating')
+    _rotate_xticks(ax)
+    fig.tight_layout()
+
+
+def draw_price_range_distribution(fig, summary, data=None):
+    ax = fig.subplots()
+    price_counts = summary.price_range_counts()
+    sns.barplot(x=price_counts.index, y=price_counts.values, ax=ax)
+    ax.set_title('Price Range Distribution', fontsize=16)
+    ax.set_xlabel('Price Range (for two people)')
+    ax.set_ylabel('Number of Restaurants')
+
+
+def draw_correlation_heatmap(fig, summary, data=None):
+    ax = fig.subplots()
+    sns.heatmap(summary.correlation(), annot=True, cmap='coolwarm', ax=ax)
+    ax.set_title('Correlation Heatmap', fontsize=16)
+
+
+# Function to lay out the word cloud for some cuisine counts at a canvas size.
+# Placing the words is the slow part, so layouts are cached.
+@functools.lru_cache(maxsize=WORDCLOUD_CACHE_SIZE)
+def wordcloud_image(frequencies, width, height):
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(width=width, height=height, background_color='white')
+    return wordcloud.generate_from_frequencies(dict(frequencies)).to_array()
+
+
+def draw_cuisine_wordcloud(fig, summary, data=None):
+    width, height = (fig.get_size_inches() * fig.dpi).astype(int)
+    frequencies = tuple(summary.cuisine_frequencies().items())
+    ax = fig.subplots()
+    ax.imshow(wordcloud_image(frequencies, int(width), int(height)), interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title('Cuisine Word Cloud', fontsize=16)
+
+
+# Query answers
+
+def draw_top_rated_restaurants(fig, summary, data=None):
+    draw_top_rated(fig, summary, data)
+
+
+def draw_cost_analysis(fig, summary, data):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Histogram of costs
+    _histplot(ax1, data[COST_COLUMN], bins=30)
+    ax1.set_title('Distribution of Costs for Two People')
+    ax1.set_xlabel('Cost')
+    ax1.set_ylabel('Frequency')
+
+    # Scatter plot of cost vs rating
+    _scatterplot(fig, ax2, data, COST_COLUMN, 'rate')
+    ax2.set_title('Cost vs Rating')
+    ax2.set_xlabel('Cost for Two People')
+    ax2.set_ylabel('Rating')
+
+    fig.tight_layout()
+
+
+def draw_rating_analysis(fig, summary, data):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Rating distribution
+    _histplot(ax1, data['rate'], bins=20)
+    ax1.set_title('Distribution of Ratings')
+    ax1.set_xlabel('Rating')
+    ax1.set_ylabel('Frequency')
+
+    # Top 10 highest rated restaurants
+    sns.barplot(x='rate', y='name', data=summary.top_rated(), ax=ax2)
+    ax2.set_title('Top 10 Highest Rated Restaurants')
+    ax2.set_xlabel('Rating')
+    ax2.set_ylabel('Restaurant Name')
+
+    fig.tight_layout()
+
+
+def draw_votes_analysis(fig, summary, data):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Votes distribution
+    _histplot(ax1, data['votes'], bins=30)
+    ax1.set_title('Distribution of Votes')
+    ax1.set_xlabel('Number of Votes')
+    ax1.set_ylabel('Frequency')
+    ax1.set_xscale('log')
+
+    # Top 10 most voted restaurants
+    sns.barplot(x='votes', y='name', data=summary.top_by_votes().head(10), ax=ax2)
+    ax2.set_title('Top 10 Most Voted Restaurants')
+    ax2.set_xlabel('Number of Votes')
+    ax2.set_ylabel('Restaurant Name')
+
+    fig.tight_layout()
+
+
+def draw_book_table_analysis(fig, summary, data=None):
+    ax1, ax2 = fig.subplots(1, 2)
+
+    # Pie chart of book table options
+    book_table_counts = summary.category_counts('book_table')
+    ax1.pie(book_table_counts, labels=book_table_counts.index, autopct='%1.1f%%')
+    ax1.set_title('Proportion of Restaurants Offering Table Booking')
+
+    # Comparison of ratings for restaurants with and without table booking
+    ax2.bxp(summary.rate_box_stats('book_table'), patch_artist=True)
+    ax2.set_title('Ratings for Restaurants With and Without Table Booking')
+    ax2.set_xlabel('Table Booking Available')
+    ax2.set_ylabel('Rating')
+
+    fig.tight_layout()
+
+
+# Views that plot individual rows, so they can't be drawn in streaming mode
+NEEDS_ROWS = {draw_cost_analysis, draw_rating_analysis, draw_votes_analysis}
+# The only columns those views read from the rows
+ROW_COLUMNS = ['rate', 'votes', COST_COLUMN]
+
+# Figure views by name, with the figure size each one is designed for
+
+SIDEBAR_VIEWS = {
+    'Restaurant Types': (draw_restaurant_types, (10, 6)),
+    'Votes Distribution': (draw_votes_distribution, (12, 6)),
+    'Rating Distribution': (draw_rating_distribution, (10, 6)),
+    'Online vs Offline Orders': (draw_online_vs_offline, (10, 6)),
+    'Average Cost for Two': (draw_average_cost, (10, 6)),
+    'Top Rated Restaurants': (draw_top_rated, (12, 6)),
+    'Price Range Distribution': (draw_price_range_distribution, (10, 6)),
+    'Correlation Heatmap': (draw_correlation_heatmap, (10, 6)),
+}
+
+QUERY_VIEWS = {
+    'top rated': (draw_top_rated_restaurants, (10, 6)),
+    'online vs offline': (draw_online_vs_offline, (10, 6)),
+    'cost': (draw_cost_analysis, (15, 6)),
+    'rating': (draw_rating_analysis, (15, 6)),
+    'votes': (draw_votes_analysis, (15, 6)),
+    'book table': (draw_book_table_analysis, (15, 6)),
+}